@@ -0,0 +1,170 @@
+import numpy as np
+from sqlalchemy import select, func, cast, Float
+
+from db import db
+from AttendanceManagement.models import Attendance
+from EmployeeManagement.models import Employee
+from AttendanceManagement.rollups import UNASSIGNED_DEPARTMENT
+
+
+# Rows pulled from the database cursor per chunk
+ANALYTICS_CHUNK_SIZE = 50000
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+# Columnar view of attendance rows: one NumPy array per column, departments
+# factorized to integer codes so grouped statistics are single bincount/sort passes.
+class AttendanceFrame:
+    def __init__(self, departments, department_codes, clock_in_minutes, total_hours):
+        self.departments = departments
+        self.department_codes = department_codes
+        self.clock_in_minutes = clock_in_minutes
+        self.total_hours = total_hours
+
+    def __len__(self):
+        return len(self.department_codes)
+
+
+# Load [date_from, date_to] of attendance joined to the employee's department
+# chunk by chunk, converting each chunk straight into arrays.
+def load_attendance_frame(date_from, date_to, department=None):
+    department_column = func.coalesce(Employee.emp_department, UNASSIGNED_DEPARTMENT)
+    minute_of_day = db.extract('hour', Attendance.clock_in_time) * 60 + db.extract('minute', Attendance.clock_in_time)
+    query = (
+        select(department_column, minute_of_day, cast(Attendance.total_hours, Float))
+        .join(Employee, Employee.id == Attendance.employee_id)
+        .where(Attendance.date >= date_from, Attendance.date <= date_to)
+    )
+    if department:
+        query = query.where(Employee.emp_department == department)
+
+    labels = {}
+    chunks = []
+    result = db.session.execute(query.execution_options(yield_per=ANALYTICS_CHUNK_SIZE))
+    for rows in result.partitions():
+        departments, minutes, hours = zip(*rows)
+        chunks.append((
+            np.fromiter((labels.setdefault(name, len(labels)) for name in departments), dtype=np.int32, count=len(rows)),
+            np.array(minutes, dtype=np.float64),
+            np.array(hours, dtype=np.float64),
+        ))
+
+    if not chunks:
+        empty = np.empty(0)
+        return AttendanceFrame([], empty.astype(np.int32), empty, empty)
+
+    columns = [np.concatenate(parts) for parts in zip(*chunks)]
+    return AttendanceFrame(list(labels), *columns)
+
+
+# Helper function to compute percentiles of values per group.
+# One lexsort puts every group's values next to each other, NaNs last.
+def grouped_percentiles(codes, values, group_count, percentiles=PERCENTILES):
+    keep = ~np.isnan(values)
+    codes, values = codes[keep], values[keep]
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    bounds = np.searchsorted(codes, np.arange(group_count + 1))
+
+    result = np.full((group_count, len(percentiles)), np.nan)
+    for group in range(group_count):
+        start, end = bounds[group], bounds[group + 1]
+        if end > start:
+            result[group] = np.percentile(values[start:end], percentiles)
+    return result
+
+
+# Helper function for per-group means, NaNs ignored
+def grouped_means(codes, values, group_count):
+    keep = ~np.isnan(values)
+    counts = np.bincount(codes[keep], minlength=group_count)
+    sums = np.bincount(codes[keep], weights=values[keep], minlength=group_count)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts, counts
+
+
+def minutes_to_time(minutes):
+    if minutes is None or np.isnan(minutes):
+        return None
+    minutes = int(round(minutes))
+    return f'{minutes // 60:02d}:{minutes % 60:02d}'
+
+
+def round_or_none(value):
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+# Average and percentile clock-in time of day per department
+def clock_in_stats(frame):
+    group_count = len(frame.departments)
+    means, counts = grouped_means(frame.department_codes, frame.clock_in_minutes, group_count)
+    percentiles = grouped_percentiles(frame.department_codes, frame.clock_in_minutes, group_count)
+    return [
+        {
+            'department': name,
+            'clock_ins': int(counts[code]),
+            'mean': minutes_to_time(means[code]),
+            **{f'p{p}': minutes_to_time(percentiles[code][i]) for i, p in enumerate(PERCENTILES)},
+        }
+        for code, name in enumerate(frame.departments)
+    ]
+
+
+# Histogram of clock-in minute of day per department, plus late counts against the shift start
+def lateness_stats(frame, shift_start_minute, grace_minutes, bin_minutes=15):
+    group_count = len(frame.departments)
+    keep = ~np.isnan(frame.clock_in_minutes)
+    codes = frame.department_codes[keep]
+    minutes = frame.clock_in_minutes[keep]
+
+    bin_count = (24 * 60) // bin_minutes
+    bins = np.minimum((minutes // bin_minutes).astype(np.int64), bin_count - 1)
+    histogram = np.bincount(codes * bin_count + bins, minlength=group_count * bin_count).reshape(group_count, bin_count)
+
+    minutes_late = minutes - (shift_start_minute + grace_minutes)
+    late = minutes_late > 0
+    late_counts = np.bincount(codes[late], minlength=group_count)
+    totals = np.bincount(codes, minlength=group_count)
+    mean_late, _ = grouped_means(codes[late], minutes_late[late], group_count)
+
+    return [
+        {
+            'department': name,
+            'clock_ins': int(totals[code]),
+            'late': int(late_counts[code]),
+            'late_rate': round(float(late_counts[code] / totals[code]), 4) if totals[code] else None,
+            'mean_minutes_late': round_or_none(mean_late[code]),
+            'histogram': {
+                minutes_to_time(bin_index * bin_minutes): int(count)
+                for bin_index, count in enumerate(histogram[code]) if count
+            },
+        }
+        for code, name in enumerate(frame.departments)
+    ]
+
+
+# Worked hours distribution and overtime share per department
+def hours_stats(frame, overtime_threshold):
+    group_count = len(frame.departments)
+    worked = frame.total_hours > 0
+    codes = frame.department_codes[worked]
+    hours = frame.total_hours[worked]
+
+    means, counts = grouped_means(codes, hours, group_count)
+    percentiles = grouped_percentiles(codes, hours, group_count)
+    overtime = np.bincount(codes[hours > overtime_threshold], minlength=group_count)
+    overtime_hours = np.bincount(codes, weights=np.maximum(hours - overtime_threshold, 0), minlength=group_count)
+
+    return [
+        {
+            'department': name,
+            'days_worked': int(counts[code]),
+            'mean_hours': round_or_none(means[code]),
+            **{f'p{p}': round_or_none(percentiles[code][i]) for i, p in enumerate(PERCENTILES)},
+            'overtime_days': int(overtime[code]),
+            'overtime_rate': round(float(overtime[code] / counts[code]), 4) if counts[code] else None,
+            'overtime_hours': round(float(overtime_hours[code]), 2),
+        }
+        for code, name in enumerate(frame.departments)
+    ]
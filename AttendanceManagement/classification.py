@@ -0,0 +1,61 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, exists, literal, func
+
+from db import db, upsert_insert
+from AttendanceManagement.models import Attendance
+from EmployeeManagement.models import Employee, WorkStatusEnum
+from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
+
+
+# Classify one day's attendance with three set-based statements:
+#   1. insert 'Absent' rows for active employees with no row and no approved leave
+#   2. 'Present' rows clocked in after shift start + grace become 'Late'
+#   3. clocked-out rows under half_day_hours become 'Half Day'
+# Employees whose Employee.country is in off_countries (stored values with a weekend
+# or holiday on this day, see CalendarRegistry.non_working_countries) are never
+# marked absent. Safe to re-run for the same day. Returns row counts, the caller commits.
+def classify_attendance_day(day, shift_start, grace_minutes, half_day_hours, off_countries=()):
+    attendance = Attendance.__table__
+
+    has_record = exists().where(Attendance.employee_id == Employee.id, Attendance.date == day)
+    on_approved_leave = exists().where(
+        LeaveRequest.employee_id == Employee.id,
+        LeaveRequest.status == LeaveStatusEnum.APPROVED,
+        LeaveRequest.start_date <= day,
+        LeaveRequest.end_date >= day
+    )
+    missing = select(Employee.id, literal(day), literal('Absent'), literal(0)).where(
+        Employee.emp_status == 'Active',
+        func.coalesce(Employee.emp_work_status, '') != WorkStatusEnum.ON_LEAVE.value,
+        (Employee.emp_start_date.is_(None)) | (Employee.emp_start_date <= day),
+        ~has_record,
+        ~on_approved_leave
+    )
+    off_countries = set(off_countries)
+    if None in off_countries:
+        missing = missing.where(Employee.country.isnot(None))
+    if off_countries - {None}:
+        missing = missing.where(Employee.country.notin_(off_countries - {None}))
+    stmt = upsert_insert(attendance).from_select(('employee_id', 'date', 'status', 'total_hours'), missing)
+    absent = db.session.execute(stmt.on_conflict_do_nothing(index_elements=['employee_id', 'date'])).rowcount
+
+    late_after = datetime.combine(day, shift_start) + timedelta(minutes=grace_minutes)
+    late = db.session.execute(
+        update(attendance)
+        .where(attendance.c.date == day, attendance.c.status == 'Present', attendance.c.clock_in_time > late_after)
+        .values(status='Late')
+    ).rowcount
+
+    half_day = db.session.execute(
+        update(attendance)
+        .where(
+            attendance.c.date == day,
+            attendance.c.status.in_(('Present', 'Late')),
+            attendance.c.clock_out_time.isnot(None),
+            attendance.c.total_hours < half_day_hours
+        )
+        .values(status='Half Day')
+    ).rowcount
+
+    return {'absent': absent, 'late': late, 'half_day': half_day}
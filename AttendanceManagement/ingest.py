@@ -0,0 +1,104 @@
+from datetime import datetime
+
+from sqlalchemy import select, update, case, tuple_
+
+from db import db, upsert_insert, hours_between, least, greatest
+from AttendanceManagement.models import Attendance
+from AttendanceManagement.rollups import refresh_rollups
+from EmployeeManagement.models import Employee
+
+
+CLOCK_DIRECTIONS = ('in', 'out')
+
+# (employee_id, date) keys per total_hours UPDATE, two bound variables each
+TOTAL_HOURS_CHUNK = 500
+
+
+# Helper function to validate one raw event, returns (employee_id, timestamp, direction)
+def parse_clock_event(event):
+    if not isinstance(event, dict):
+        raise ValueError('Event must be an object')
+    try:
+        employee_id = int(event['employee_id'])
+        timestamp = datetime.fromisoformat(event['timestamp'])
+    except (KeyError, TypeError, ValueError):
+        raise ValueError('employee_id and an ISO 8601 timestamp are required')
+    direction = event.get('direction')
+    if direction not in CLOCK_DIRECTIONS:
+        raise ValueError('direction must be "in" or "out"')
+    if timestamp.tzinfo:
+        # Attendance stores naive local times, same as ClockIn/ClockOut
+        timestamp = timestamp.astimezone().replace(tzinfo=None)
+    return employee_id, timestamp, direction
+
+
+# Apply a batch of badge/kiosk punches with a handful of set-based statements:
+# one employee lookup, one batched upsert on unique_employee_date, an UPDATE of
+# total_hours per TOTAL_HOURS_CHUNK touched rows and a rollup refresh. Returns per-event results, the caller commits.
+def ingest_clock_events(events):
+    results = [None] * len(events)
+    parsed = {}
+    for index, event in enumerate(events):
+        try:
+            parsed[index] = parse_clock_event(event)
+        except ValueError as error:
+            results[index] = {'index': index, 'status': 'rejected', 'message': str(error)}
+
+    requested_ids = {employee_id for employee_id, _, _ in parsed.values()}
+    known_ids = set(db.session.scalars(select(Employee.id).where(Employee.id.in_(requested_ids)))) if requested_ids else set()
+
+    # Collapse the punches to one row per employee and day: earliest in, latest out
+    rows = {}
+    for index, (employee_id, timestamp, direction) in parsed.items():
+        if employee_id not in known_ids:
+            results[index] = {'index': index, 'status': 'rejected', 'message': 'Unknown employee'}
+            continue
+        row = rows.setdefault((employee_id, timestamp.date()), {
+            'employee_id': employee_id,
+            'date': timestamp.date(),
+            'clock_in_time': None,
+            'clock_out_time': None,
+            'total_hours': 0,
+            'status': 'Present',
+        })
+        if direction == 'in' and (row['clock_in_time'] is None or timestamp < row['clock_in_time']):
+            row['clock_in_time'] = timestamp
+        if direction == 'out' and (row['clock_out_time'] is None or timestamp > row['clock_out_time']):
+            row['clock_out_time'] = timestamp
+        results[index] = {'index': index, 'status': 'applied', 'employee_id': employee_id}
+
+    if not rows:
+        return results
+
+    attendance = Attendance.__table__
+    stmt = upsert_insert(attendance)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['employee_id', 'date'],
+        set_={
+            'clock_in_time': least(attendance.c.clock_in_time, stmt.excluded.clock_in_time),
+            'clock_out_time': greatest(attendance.c.clock_out_time, stmt.excluded.clock_out_time),
+            'status': case((attendance.c.status == 'Absent', 'Present'), else_=attendance.c.status),
+            'updated_at': stmt.excluded.updated_at,
+        }
+    )
+    db.session.execute(stmt, list(rows.values()))
+
+    # total_hours for exactly the touched (employee_id, date) rows, so rows outside the
+    # batch keep their updated_at (and /attendance/my-attendance ETags)
+    keys = list(rows)
+    for start in range(0, len(keys), TOTAL_HOURS_CHUNK):
+        db.session.execute(
+            update(attendance)
+            .where(
+                tuple_(attendance.c.employee_id, attendance.c.date).in_(keys[start:start + TOTAL_HOURS_CHUNK]),
+                attendance.c.clock_out_time > attendance.c.clock_in_time
+            )
+            .values(total_hours=hours_between(attendance.c.clock_in_time, attendance.c.clock_out_time))
+        )
+
+    employee_ids = {employee_id for employee_id, _ in rows}
+    first_day = min(day for _, day in rows)
+    last_day = max(day for _, day in rows)
+
+    refresh_rollups(first_day, last_day, employee_ids=employee_ids)
+    return results
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from typing import Optional
-from sqlalchemy import Integer, Date, DateTime, Enum, Numeric, ForeignKey, UniqueConstraint
+from sqlalchemy import Integer, String, Date, DateTime, Enum, Numeric, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from db import db
 
@@ -17,10 +17,55 @@ class Attendance(db.Model):
         Enum("Present", "Absent", "Late", "Half Day", name="attendance_status_enum"),
         default="Absent"
     )
+    # Not set by ON CONFLICT DO UPDATE on its own, upserts must include it
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now, server_default=func.now()
+    )
 
     
     employee = relationship("Employee", back_populates="attendance_records")
 
     __table_args__ = (
+        # Also serves as the (employee_id, date) index for per-employee range scans
         UniqueConstraint("employee_id", "date", name="unique_employee_date"),
+        Index("ix_attendance_date", "date"),
+        # count/max(updated_at) fingerprint of /attendance/my-attendance
+        Index("ix_attendance_employee_updated", "employee_id", "updated_at"),
+    )
+
+
+# Aggregates kept up to date by AttendanceManagement.rollups.
+# days_present counts every day the employee showed up (Present, Late or Half Day).
+class EmployeeMonthlyAttendance(db.Model):
+    __tablename__ = "attendance_monthly_rollup"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employee.id", ondelete="CASCADE"), nullable=False)
+    month: Mapped[date] = mapped_column(Date, nullable=False)  # first day of the month
+    total_hours: Mapped[float] = mapped_column(Numeric(8, 2), nullable=False, default=0)
+    days_present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_half_day: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("employee_id", "month", name="unique_employee_month"),
+        Index("ix_attendance_monthly_rollup_month", "month"),
+    )
+
+
+class DepartmentDailyAttendance(db.Model):
+    __tablename__ = "attendance_department_daily_rollup"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    department: Mapped[str] = mapped_column(String(50), nullable=False)
+    date: Mapped[datetime.date] = mapped_column(Date, nullable=False)
+    total_hours: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False, default=0)
+    days_present: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_late: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_half_day: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    days_absent: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("department", "date", name="unique_department_date"),
     )
@@ -0,0 +1,140 @@
+from datetime import timedelta
+
+import click
+from flask.cli import AppGroup
+from sqlalchemy import select, delete, func, case, literal
+
+from db import db, upsert_insert, month_start
+from AttendanceManagement.models import Attendance, EmployeeMonthlyAttendance, DepartmentDailyAttendance
+from EmployeeManagement.models import Employee
+
+
+ROLLUP_COUNTERS = ('total_hours', 'days_present', 'days_late', 'days_half_day', 'days_absent')
+
+# Department bucket for employees that have not been assigned one yet
+UNASSIGNED_DEPARTMENT = 'Unassigned'
+
+
+# Helper function to get what a single attendance row adds to the rollups
+def row_contribution(status, total_hours):
+    if status is None:
+        return dict.fromkeys(ROLLUP_COUNTERS, 0)
+    return {
+        'total_hours': float(total_hours or 0),
+        'days_present': int(status in ('Present', 'Late', 'Half Day')),
+        'days_late': int(status == 'Late'),
+        'days_half_day': int(status == 'Half Day'),
+        'days_absent': int(status == 'Absent'),
+    }
+
+
+# Add the difference between an attendance row's old and new (status, total_hours)
+# to both rollups. Runs in the caller's transaction so it commits with the row.
+def apply_attendance_change(employee_id, day, old=(None, 0), new=(None, 0)):
+    before, after = row_contribution(*old), row_contribution(*new)
+    delta = {counter: after[counter] - before[counter] for counter in ROLLUP_COUNTERS}
+    if not any(delta.values()):
+        return
+
+    monthly = upsert_insert(EmployeeMonthlyAttendance).values(
+        employee_id=employee_id, month=day.replace(day=1), **delta
+    )
+    db.session.execute(monthly.on_conflict_do_update(
+        index_elements=['employee_id', 'month'],
+        set_={counter: getattr(EmployeeMonthlyAttendance, counter) + monthly.excluded[counter] for counter in ROLLUP_COUNTERS}
+    ))
+
+    # The department is read in the same statement instead of a separate lookup
+    department = select(
+        func.coalesce(Employee.emp_department, UNASSIGNED_DEPARTMENT),
+        literal(day),
+        *(literal(delta[counter]) for counter in ROLLUP_COUNTERS)
+    ).where(Employee.id == employee_id)
+    daily = upsert_insert(DepartmentDailyAttendance).from_select(('department', 'date') + ROLLUP_COUNTERS, department)
+    db.session.execute(daily.on_conflict_do_update(
+        index_elements=['department', 'date'],
+        set_={counter: getattr(DepartmentDailyAttendance, counter) + daily.excluded[counter] for counter in ROLLUP_COUNTERS}
+    ))
+
+
+# Aggregate columns computed from raw attendance rows
+def rollup_aggregates():
+    present = Attendance.status.in_(('Present', 'Late', 'Half Day'))
+    return (
+        func.coalesce(func.sum(Attendance.total_hours), 0),
+        func.sum(case((present, 1), else_=0)),
+        func.sum(case((Attendance.status == 'Late', 1), else_=0)),
+        func.sum(case((Attendance.status == 'Half Day', 1), else_=0)),
+        func.sum(case((Attendance.status == 'Absent', 1), else_=0)),
+    )
+
+
+# Recompute the rollups touched by [date_from, date_to] from raw attendance with
+# a few set-based statements. Used by bulk writers and the rebuild command.
+# With employee_ids only those employees' months and their departments' days are refreshed.
+def refresh_rollups(date_from, date_to, employee_ids=None):
+    first_month = date_from.replace(day=1)
+    after_last_month = (date_to.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+    # Per employee per month
+    month_filter = [EmployeeMonthlyAttendance.month >= first_month, EmployeeMonthlyAttendance.month < after_last_month]
+    attendance_filter = [Attendance.date >= first_month, Attendance.date < after_last_month]
+    if employee_ids is not None:
+        month_filter.append(EmployeeMonthlyAttendance.employee_id.in_(employee_ids))
+        attendance_filter.append(Attendance.employee_id.in_(employee_ids))
+
+    db.session.execute(delete(EmployeeMonthlyAttendance).where(*month_filter))
+    month = month_start(Attendance.date)
+    db.session.execute(
+        EmployeeMonthlyAttendance.__table__.insert().from_select(
+            ('employee_id', 'month') + ROLLUP_COUNTERS,
+            select(Attendance.employee_id, month, *rollup_aggregates())
+            .where(*attendance_filter)
+            .group_by(Attendance.employee_id, month)
+        )
+    )
+
+    # Per department per day
+    department = func.coalesce(Employee.emp_department, UNASSIGNED_DEPARTMENT)
+    day_filter = [DepartmentDailyAttendance.date >= date_from, DepartmentDailyAttendance.date <= date_to]
+    attendance_filter = [Attendance.date >= date_from, Attendance.date <= date_to]
+    if employee_ids is not None:
+        departments = select(department).where(Employee.id.in_(employee_ids)).distinct()
+        day_filter.append(DepartmentDailyAttendance.department.in_(departments))
+        attendance_filter.append(department.in_(departments))
+
+    db.session.execute(delete(DepartmentDailyAttendance).where(*day_filter))
+    db.session.execute(
+        DepartmentDailyAttendance.__table__.insert().from_select(
+            ('department', 'date') + ROLLUP_COUNTERS,
+            select(department, Attendance.date, *rollup_aggregates())
+            .join(Employee, Employee.id == Attendance.employee_id)
+            .where(*attendance_filter)
+            .group_by(department, Attendance.date)
+        )
+    )
+
+
+rollups_cli = AppGroup('rollups', help='Attendance rollup maintenance.')
+
+
+@rollups_cli.command('rebuild')
+@click.option('--from', 'date_from', type=click.DateTime(formats=['%Y-%m-%d']), help='First day to rebuild (default: oldest record).')
+@click.option('--to', 'date_to', type=click.DateTime(formats=['%Y-%m-%d']), help='Last day to rebuild (default: newest record).')
+def rebuild_rollups(date_from, date_to):
+    """Backfill the attendance rollups from raw attendance, one month per transaction."""
+    oldest, newest = db.session.query(func.min(Attendance.date), func.max(Attendance.date)).one()
+    if oldest is None:
+        click.echo('No attendance records found.')
+        return
+
+    start = date_from.date() if date_from else oldest
+    end = date_to.date() if date_to else newest
+
+    month = start.replace(day=1)
+    while month <= end:
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        refresh_rollups(max(month, start), min(next_month - timedelta(days=1), end))
+        db.session.commit()
+        click.echo(f'Rebuilt rollups for {month:%Y-%m}')
+        month = next_month
@@ -1,17 +1,35 @@
+import csv
+import io
+import json
 from flask_restx import Namespace, Resource, fields, marshal
 from flask_jwt_extended import jwt_required
 from datetime import datetime, date
-from sqlalchemy import and_
-from flask import request
-
-from db import db
-from AttendanceManagement.models import Attendance
+from sqlalchemy import and_, update, func
+from flask import request, Response, stream_with_context, current_app
+
+from db import db, upsert_insert, hours_between
+from AttendanceManagement.models import Attendance, EmployeeMonthlyAttendance, DepartmentDailyAttendance
+from AttendanceManagement.rollups import apply_attendance_change
+from AttendanceManagement.ingest import ingest_clock_events
+from AttendanceManagement.status_cache import get_clock_status, set_clock_status, forget_clock_status
+from AttendanceManagement.analytics import load_attendance_frame, clock_in_stats, lateness_stats, hours_stats
 from EmployeeManagement.models import Employee
+from EmployeeManagement.roster import department_member_ids
 from Authentication.models import Auth
-from helpers import get_current_employee, get_filtered_attendance
+from serializers import RowSerializer, json_response
+from helpers import (
+    get_current_employee, get_filtered_attendance, get_attendance_filter_args,
+    filter_attendance, get_page_args, paginate_keyset, parse_date_arg,
+    make_etag, etag_headers, not_modified
+)
 
 attendance_ns = Namespace('attendance', description='Attendance management')
 
+# Rows fetched per round trip by the streaming export
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = ('id', 'employee_id', 'date', 'clock_in_time', 'clock_out_time', 'total_hours', 'status')
+
 # Schemas
 attendance_model = attendance_ns.model('Attendance', {
     'id': fields.Integer,
@@ -23,10 +41,67 @@ attendance_model = attendance_ns.model('Attendance', {
     'status': fields.String
 })
 
+attendance_serializer = RowSerializer(attendance_model, Attendance)
+
+attendance_page_model = attendance_ns.model('AttendancePage', {
+    'items': fields.List(fields.Nested(attendance_model)),
+    'next_cursor': fields.String(description='Pass as ?cursor= to fetch the next page')
+})
+
+monthly_summary_model = attendance_ns.model('MonthlyAttendanceSummary', {
+    'employee_id': fields.Integer,
+    'month': fields.String,
+    'total_hours': fields.Float,
+    'days_present': fields.Integer,
+    'days_late': fields.Integer,
+    'days_half_day': fields.Integer,
+    'days_absent': fields.Integer
+})
+
+department_summary_model = attendance_ns.model('DepartmentAttendanceSummary', {
+    'department': fields.String,
+    'date': fields.String,
+    'total_hours': fields.Float,
+    'days_present': fields.Integer,
+    'days_late': fields.Integer,
+    'days_half_day': fields.Integer,
+    'days_absent': fields.Integer
+})
+
+clock_event_model = attendance_ns.model('ClockEvent', {
+    'employee_id': fields.Integer(required=True),
+    'timestamp': fields.String(required=True, description='ISO 8601 timestamp of the punch'),
+    'direction': fields.String(required=True, enum=['in', 'out'])
+})
+
+clock_event_batch_model = attendance_ns.model('ClockEventBatch', {
+    'events': fields.List(fields.Nested(clock_event_model), required=True)
+})
+
 message_model = attendance_ns.model('Message', {
     'message': fields.String
 })
 
+# Query parameters shared by the attendance listing endpoints
+date_filter_params = {
+    'year': 'Filter by year',
+    'month': 'Filter by month (1-12)',
+    'day': 'Filter by day of month',
+    'from': 'Start date (YYYY-MM-DD), inclusive',
+    'to': 'End date (YYYY-MM-DD), inclusive',
+}
+
+page_params = {
+    'limit': 'Maximum number of records per page',
+    'cursor': 'Opaque cursor returned as next_cursor by the previous page',
+}
+
+analytics_params = {
+    'from': 'Start date (YYYY-MM-DD), defaults to the first of the current month',
+    'to': 'End date (YYYY-MM-DD), inclusive, defaults to today',
+    'department': 'Department filter (HR admins only)'
+}
+
 
 
 @attendance_ns.route('/status')
@@ -34,14 +109,7 @@ class ClockStatus(Resource):
     @jwt_required()
     def get(self):
         claims = get_current_employee()
-        today = date.today()
-        record = Attendance.query.filter_by(employee_id=claims['emp_id'], date=today).first()
-        if not record:
-            return {'status': 'not_clocked_in'}, 200
-        elif record.clock_out_time:
-            return {'status': 'clocked_out'}, 200
-        else:
-            return {'status': 'clocked_in'}, 200
+        return {'status': get_clock_status(claims['emp_id'])}, 200
 
 
 @attendance_ns.route('/clock-in')
@@ -54,18 +122,22 @@ class ClockIn(Resource):
         claims = get_current_employee()
         today = date.today()
 
-        existing = Attendance.query.filter_by(employee_id=claims['emp_id'], date=today).first()
-        if existing:
-            return {'message': 'Already clocked in today.'}, 400
-
-        attendance = Attendance(
+        # Single INSERT ... ON CONFLICT DO NOTHING, concurrent double taps cannot race
+        attendance = Attendance.__table__
+        stmt = upsert_insert(attendance).values(
             employee_id=claims['emp_id'],
             date=today,
             clock_in_time=datetime.now(),
+            total_hours=0,
             status='Present'
-        )
-        db.session.add(attendance)
+        ).on_conflict_do_nothing(index_elements=['employee_id', 'date']).returning(attendance.c.id)
+
+        if db.session.execute(stmt).first() is None:
+            return {'message': 'Already clocked in today.'}, 400
+
+        apply_attendance_change(claims['emp_id'], today, new=('Present', 0))
         db.session.commit()
+        set_clock_status(claims['emp_id'], 'clocked_in', today)
         return {'message': 'Clock-in successful'}, 200
 
 @attendance_ns.route('/clock-out')
@@ -77,39 +149,91 @@ class ClockOut(Resource):
     def post(self):
         claims = get_current_employee()
         today = date.today()
-
-        attendance = Attendance.query.filter_by(employee_id=claims['emp_id'], date=today).first()
-        if not attendance or attendance.clock_out_time:
+        now = datetime.now()
+
+        # Single conditional UPDATE, hours are computed by the database
+        attendance = Attendance.__table__
+        stmt = update(attendance).where(
+            attendance.c.employee_id == claims['emp_id'],
+            attendance.c.date == today,
+            attendance.c.clock_in_time.isnot(None),
+            attendance.c.clock_out_time.is_(None)
+        ).values(
+            clock_out_time=now,
+            total_hours=hours_between(attendance.c.clock_in_time, now)
+        ).returning(attendance.c.status, attendance.c.total_hours)
+
+        record = db.session.execute(stmt).first()
+        if record is None:
             return {'message': 'Cannot clock out. Either not clocked in or already clocked out.'}, 400
 
-        attendance.clock_out_time = datetime.now()
-        delta = attendance.clock_out_time - attendance.clock_in_time
-        attendance.total_hours = round(delta.total_seconds() / 3600, 2)
+        # total_hours is only set on clock-out, so the row contributed 0 hours before
+        apply_attendance_change(claims['emp_id'], today, old=(record.status, 0), new=(record.status, record.total_hours))
         db.session.commit()
+        set_clock_status(claims['emp_id'], 'clocked_out', today)
 
         return {'message': 'Clock-out successful'}, 200
 
 
 
+@attendance_ns.route('/events/bulk')
+class BulkClockEvents(Resource):
+    @attendance_ns.doc(
+        description="Ingest a batch of clock-in/clock-out punches from badge readers and kiosks."
+    )
+    @attendance_ns.expect(clock_event_batch_model)
+    @jwt_required()
+    def post(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
+            return {'message': 'Access denied'}, 403
+
+        events = (request.json or {}).get('events')
+        if not isinstance(events, list) or not events:
+            return {'message': 'events must be a non-empty list.'}, 400
+        if len(events) > current_app.config.get('ATTENDANCE_BULK_MAX_EVENTS', 10000):
+            return {'message': 'Too many events in one batch.'}, 413
+
+        results = ingest_clock_events(events)
+        db.session.commit()
+        forget_clock_status({result['employee_id'] for result in results if result['status'] == 'applied'})
+
+        applied = sum(1 for result in results if result['status'] == 'applied')
+        return {'applied': applied, 'rejected': len(results) - applied, 'results': results}, 200
+
+
+
 
 @attendance_ns.route('/my-attendance')
 class MyAttendance(Resource):
     @attendance_ns.doc(
-        description="Get attendance records for the current user."
+        description="Get attendance records for the current user. Send If-None-Match with the last ETag to get 304 when nothing changed.",
+        params=date_filter_params
     )
     @jwt_required()
     def get(self):
         claims = get_current_employee()
-        year = request.args.get('year', type=int)
-        month = request.args.get('month', type=int)
-        day = request.args.get('day', type=int)
+        try:
+            filters = get_attendance_filter_args()
+        except ValueError:
+            return {'message': 'Invalid date filter. Use YYYY-MM-DD for from/to.'}, 400
 
         queryset = Attendance.query.filter_by(employee_id=claims['emp_id'])
-        records = get_filtered_attendance(queryset, year, month, day)
+
+        # count/max(updated_at) of the same rows, read from ix_attendance_employee_updated
+        fingerprint = filter_attendance(
+            queryset.with_entities(func.count(Attendance.id), func.max(Attendance.updated_at)), **filters
+        ).one()
+        etag = make_etag(*fingerprint)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        records = get_filtered_attendance(queryset.with_entities(*attendance_serializer.columns), **filters)
 
         if not records:
-            return {'message': 'No attendance records found.'}, 200
-        return marshal(records, attendance_model), 200
+            return {'message': 'No attendance records found.'}, 200, etag_headers(etag)
+        return json_response(attendance_serializer.serialize_all(records), headers=etag_headers(etag))
 
 
 
@@ -117,29 +241,28 @@ class MyAttendance(Resource):
 @attendance_ns.route('/department-attendance')
 class DepartmentAttendance(Resource):
     @attendance_ns.doc(
-        description="Get attendance records for the current user's department."
+        description="Get attendance records for the current user's department.",
+        params={**date_filter_params, **page_params}
     )
+    @attendance_ns.response(200, 'Success', model=attendance_page_model)
     @jwt_required()
     def get(self):
         claims = get_current_employee()
         if claims['emp_rank'] != 'manager':
             return {'message': 'Access denied'}, 403
 
-        year = request.args.get('year', type=int)
-        month = request.args.get('month', type=int)
-        day = request.args.get('day', type=int)
-
-        department_employees = Employee.query.filter_by(
-            emp_department=claims['emp_department']
-        ).with_entities(Employee.id)
+        queryset = Attendance.query.with_entities(*attendance_serializer.columns).filter(
+            Attendance.employee_id.in_(department_member_ids(claims['emp_department']))
+        )
 
-        emp_ids = [emp.id for emp in department_employees]
-        queryset = Attendance.query.filter(Attendance.employee_id.in_(emp_ids))
-        records = get_filtered_attendance(queryset, year, month, day)
+        try:
+            queryset = filter_attendance(queryset, **get_attendance_filter_args())
+            limit, cursor = get_page_args()
+            records, next_cursor = paginate_keyset(queryset, Attendance.date, Attendance.id, cursor, limit)
+        except ValueError:
+            return {'message': 'Invalid date filter or cursor.'}, 400
 
-        if not records:
-            return {'message': 'No attendance records found for department.'}, 200
-        return marshal(records, attendance_model), 200
+        return json_response({'items': attendance_serializer.serialize_all(records), 'next_cursor': next_cursor})
 
 
 
@@ -148,24 +271,24 @@ class DepartmentAttendance(Resource):
 @attendance_ns.route('/all-attendance')
 class AllAttendance(Resource):
     @attendance_ns.doc(
-        description="Get attendance records for all employees."
+        description="Get attendance records for all employees.",
+        params={**date_filter_params, **page_params}
     )
+    @attendance_ns.response(200, 'Success', model=attendance_page_model)
     @jwt_required()
     def get(self):
         claims = get_current_employee()
         if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
             return {'message': 'Access denied'}, 403
 
-        year = request.args.get('year', type=int)
-        month = request.args.get('month', type=int)
-        day = request.args.get('day', type=int)
+        try:
+            queryset = filter_attendance(Attendance.query.with_entities(*attendance_serializer.columns), **get_attendance_filter_args())
+            limit, cursor = get_page_args()
+            records, next_cursor = paginate_keyset(queryset, Attendance.date, Attendance.id, cursor, limit)
+        except ValueError:
+            return {'message': 'Invalid date filter or cursor.'}, 400
 
-        queryset = Attendance.query
-        records = get_filtered_attendance(queryset, year, month, day)
-
-        if not records:
-            return {'message': 'No attendance records found.'}, 200
-        return marshal(records, attendance_model), 200
+        return json_response({'items': attendance_serializer.serialize_all(records), 'next_cursor': next_cursor})
 
 
 
@@ -173,7 +296,8 @@ class AllAttendance(Resource):
 @attendance_ns.route('/employee/<int:id>/attendance')
 class AttendanceByID(Resource):
     @attendance_ns.doc(
-        description="Get attendance records for a specific employee."
+        description="Get attendance records for a specific employee.",
+        params=date_filter_params
     )
     @jwt_required()
     def get(self, id):
@@ -181,13 +305,245 @@ class AttendanceByID(Resource):
         if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
             return {'message': 'Access denied'}, 403
 
-        year = request.args.get('year', type=int)
-        month = request.args.get('month', type=int)
-        day = request.args.get('day', type=int)
+        try:
+            filters = get_attendance_filter_args()
+        except ValueError:
+            return {'message': 'Invalid date filter. Use YYYY-MM-DD for from/to.'}, 400
 
-        queryset = Attendance.query.filter_by(employee_id=id)
-        records = get_filtered_attendance(queryset, year, month, day)
+        queryset = Attendance.query.with_entities(*attendance_serializer.columns).filter_by(employee_id=id)
+        records = get_filtered_attendance(queryset, **filters)
 
         if not records:
             return {'message': 'No attendance records found for employee.'}, 200
-        return marshal(records, attendance_model), 200
\ No newline at end of file
+        return json_response(attendance_serializer.serialize_all(records))
+
+
+
+
+@attendance_ns.route('/summary/employees')
+class EmployeeAttendanceSummary(Resource):
+    @attendance_ns.doc(
+        description="Get per-employee monthly attendance totals from the rollup tables.",
+        params={'month': 'Month (YYYY-MM), defaults to the current month', 'department': 'Department filter (HR admins only)'}
+    )
+    @attendance_ns.response(200, 'Success', model=[monthly_summary_model])
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        try:
+            month = datetime.strptime(request.args.get('month') or date.today().strftime('%Y-%m'), '%Y-%m').date()
+        except ValueError:
+            return {'message': 'Invalid month format. Use YYYY-MM.'}, 400
+
+        query = EmployeeMonthlyAttendance.query.filter_by(month=month)
+        if claims['emp_rank'] == 'admin' and claims['emp_department'] == 'Human Resource':
+            department = request.args.get('department')
+        elif claims['emp_rank'] == 'manager':
+            department = claims['emp_department']
+        else:
+            department = None
+            query = query.filter_by(employee_id=claims['emp_id'])
+
+        if department:
+            query = query.join(Employee, Employee.id == EmployeeMonthlyAttendance.employee_id) \
+                         .filter(Employee.emp_department == department)
+
+        records = query.order_by(EmployeeMonthlyAttendance.employee_id).all()
+        return marshal(records, monthly_summary_model), 200
+
+
+
+@attendance_ns.route('/summary/departments')
+class DepartmentAttendanceSummary(Resource):
+    @attendance_ns.doc(
+        description="Get per-department daily attendance totals from the rollup tables.",
+        params={
+            'from': 'Start date (YYYY-MM-DD), defaults to the first of the current month',
+            'to': 'End date (YYYY-MM-DD), inclusive, defaults to today',
+            'department': 'Department filter (HR admins only)'
+        }
+    )
+    @attendance_ns.response(200, 'Success', model=[department_summary_model])
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] == 'admin' and claims['emp_department'] == 'Human Resource':
+            department = request.args.get('department')
+        elif claims['emp_rank'] == 'manager':
+            department = claims['emp_department']
+        else:
+            return {'message': 'Access denied'}, 403
+
+        try:
+            date_from = parse_date_arg(request.args.get('from')) or date.today().replace(day=1)
+            date_to = parse_date_arg(request.args.get('to')) or date.today()
+        except ValueError:
+            return {'message': 'Invalid date format. Use YYYY-MM-DD.'}, 400
+
+        query = DepartmentDailyAttendance.query.filter(
+            DepartmentDailyAttendance.date >= date_from,
+            DepartmentDailyAttendance.date <= date_to
+        )
+        if department:
+            query = query.filter_by(department=department)
+
+        records = query.order_by(DepartmentDailyAttendance.date, DepartmentDailyAttendance.department).all()
+        return marshal(records, department_summary_model), 200
+
+
+
+
+# Helper function to resolve the date range and department scope of an analytics call.
+# Returns (date_from, date_to, department) or an error response tuple.
+def get_analytics_scope(claims):
+    if claims['emp_rank'] == 'admin' and claims['emp_department'] == 'Human Resource':
+        department = request.args.get('department')
+    elif claims['emp_rank'] == 'manager':
+        department = claims['emp_department']
+    else:
+        return None, ({'message': 'Access denied'}, 403)
+
+    try:
+        date_from = parse_date_arg(request.args.get('from')) or date.today().replace(day=1)
+        date_to = parse_date_arg(request.args.get('to')) or date.today()
+    except ValueError:
+        return None, ({'message': 'Invalid date format. Use YYYY-MM-DD.'}, 400)
+    return (date_from, date_to, department), None
+
+
+@attendance_ns.route('/analytics/clock-in')
+class ClockInAnalytics(Resource):
+    @attendance_ns.doc(
+        description="Average and percentile clock-in time per department.",
+        params=analytics_params
+    )
+    @jwt_required()
+    def get(self):
+        scope, error = get_analytics_scope(get_current_employee())
+        if error:
+            return error
+        date_from, date_to, department = scope
+
+        frame = load_attendance_frame(date_from, date_to, department)
+        return {'from': str(date_from), 'to': str(date_to), 'departments': clock_in_stats(frame)}, 200
+
+
+@attendance_ns.route('/analytics/lateness')
+class LatenessAnalytics(Resource):
+    @attendance_ns.doc(
+        description="Clock-in time histogram and late arrivals per department.",
+        params={**analytics_params, 'bin_minutes': 'Histogram bin width in minutes (default 15)'}
+    )
+    @jwt_required()
+    def get(self):
+        scope, error = get_analytics_scope(get_current_employee())
+        if error:
+            return error
+        date_from, date_to, department = scope
+
+        bin_minutes = request.args.get('bin_minutes', default=15, type=int)
+        if not 1 <= bin_minutes <= 240:
+            return {'message': 'bin_minutes must be between 1 and 240.'}, 400
+
+        shift_start = datetime.strptime(current_app.config.get('SHIFT_START', '09:00'), '%H:%M')
+        frame = load_attendance_frame(date_from, date_to, department)
+        stats = lateness_stats(
+            frame,
+            shift_start_minute=shift_start.hour * 60 + shift_start.minute,
+            grace_minutes=current_app.config.get('LATE_GRACE_MINUTES', 0),
+            bin_minutes=bin_minutes
+        )
+        return {'from': str(date_from), 'to': str(date_to), 'departments': stats}, 200
+
+
+@attendance_ns.route('/analytics/hours')
+class HoursAnalytics(Resource):
+    @attendance_ns.doc(
+        description="Worked hours percentiles and overtime per department.",
+        params=analytics_params
+    )
+    @jwt_required()
+    def get(self):
+        scope, error = get_analytics_scope(get_current_employee())
+        if error:
+            return error
+        date_from, date_to, department = scope
+
+        frame = load_attendance_frame(date_from, date_to, department)
+        stats = hours_stats(frame, overtime_threshold=current_app.config.get('OVERTIME_THRESHOLD_HOURS', 8))
+        return {'from': str(date_from), 'to': str(date_to), 'departments': stats}, 200
+
+
+
+
+# Helper generators for the streaming export, one chunk of text per fetched batch
+def export_rows(query):
+    for row in query.yield_per(EXPORT_BATCH_SIZE):
+        yield (
+            row.id,
+            row.employee_id,
+            str(row.date),
+            str(row.clock_in_time) if row.clock_in_time else None,
+            str(row.clock_out_time) if row.clock_out_time else None,
+            float(row.total_hours) if row.total_hours is not None else None,
+            row.status,
+        )
+
+
+def generate_csv(query):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for count, row in enumerate(export_rows(query), start=1):
+        writer.writerow(row)
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def generate_ndjson(query):
+    lines = []
+    for row in export_rows(query):
+        lines.append(json.dumps(dict(zip(EXPORT_COLUMNS, row))))
+        if len(lines) == EXPORT_BATCH_SIZE:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+@attendance_ns.route('/export')
+class ExportAttendance(Resource):
+    @attendance_ns.doc(
+        description="Stream attendance records for all employees as CSV or NDJSON.",
+        params={**date_filter_params, 'format': 'csv (default) or ndjson'}
+    )
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
+            return {'message': 'Access denied'}, 403
+
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return {'message': 'Unsupported format. Use csv or ndjson.'}, 400
+
+        try:
+            filters = get_attendance_filter_args()
+        except ValueError:
+            return {'message': 'Invalid date filter. Use YYYY-MM-DD for from/to.'}, 400
+
+        # Plain column rows streamed from a server-side cursor, no ORM objects are built
+        query = db.session.query(*(getattr(Attendance, column) for column in EXPORT_COLUMNS))
+        query = filter_attendance(query, **filters).order_by(Attendance.date, Attendance.id)
+
+        if export_format == 'csv':
+            body, mimetype = generate_csv(query), 'text/csv'
+        else:
+            body, mimetype = generate_ndjson(query), 'application/x-ndjson'
+
+        response = Response(stream_with_context(body), mimetype=mimetype)
+        response.headers['Content-Disposition'] = f'attachment; filename=attendance.{export_format}'
+        return response
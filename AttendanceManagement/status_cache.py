@@ -0,0 +1,45 @@
+from datetime import date, datetime, timedelta
+
+from extensions import status_cache
+from AttendanceManagement.models import Attendance
+
+
+# Keys carry the day, so yesterday's entries are never read after midnight and
+# expire on their own at the end of the day they describe.
+def status_key(employee_id, day):
+    return f'{day.isoformat()}:{employee_id}'
+
+
+def seconds_until_end_of(day):
+    end_of_day = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    return max(1, int((end_of_day - datetime.now()).total_seconds()) + 1)
+
+
+# Write-through from the clock-in/clock-out paths, after their commit
+def set_clock_status(employee_id, status, day=None):
+    day = day or date.today()
+    status_cache.set(status_key(employee_id, day), status, ttl=seconds_until_end_of(day))
+
+
+def forget_clock_status(employee_ids, day=None):
+    day = day or date.today()
+    status_cache.delete(*(status_key(employee_id, day) for employee_id in employee_ids))
+
+
+# Today's status for an employee, reading the database only on a cache miss.
+# The miss is filled with add, not set, so a clock-in/clock-out write-through that
+# lands between our read and our write is not overwritten with the older status.
+def get_clock_status(employee_id):
+    today = date.today()
+    status = status_cache.get(status_key(employee_id, today))
+    if status is None:
+        record = Attendance.query.filter_by(employee_id=employee_id, date=today) \
+                                 .with_entities(Attendance.clock_in_time, Attendance.clock_out_time).first()
+        if not record or not record.clock_in_time:
+            status = 'not_clocked_in'
+        elif record.clock_out_time:
+            status = 'clocked_out'
+        else:
+            status = 'clocked_in'
+        status_cache.add(status_key(employee_id, today), status, ttl=seconds_until_end_of(today))
+    return status
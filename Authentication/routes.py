@@ -4,7 +4,9 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt
 from db import db
 from extensions import bcrypt, blacklist
 from Authentication.models import Auth
-from EmployeeManagement.models import Employee
+from EmployeeManagement.models import Employee, WorkStatusEnum
+from EmployeeManagement.search import employee_search
+from EmployeeManagement.roster import bump_roster
 
 auth_ns = Namespace('authentication', description='Authentication related operations')
 
@@ -78,10 +80,12 @@ class Register(Resource):
             emp_start_date=date.today(),
             emp_end_date=None,
             emp_status="Active",
-            emp_work_status="In office"
+            emp_work_status=WorkStatusEnum.IN_OFFICE.value
         )
         db.session.add(employee)
         db.session.commit()
+        employee_search.update(employee)
+        bump_roster(employee.emp_department)
 
         return {"message": "User registered successfully"}, 201
 
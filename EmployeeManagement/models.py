@@ -1,8 +1,16 @@
 from db import db
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Integer, String, Date
+from sqlalchemy import Integer, String, Date, DateTime, Index, func
+from enum import Enum
 import datetime
 
+
+# Values stored in Employee.emp_work_status
+class WorkStatusEnum(str, Enum):
+    IN_OFFICE = 'In office'
+    ON_LEAVE = 'On leave'
+
+
 # Data Model for Employee Bio-data
 class Employee(db.Model):
     __tablename__ = "employee"
@@ -22,15 +30,30 @@ class Employee(db.Model):
     emp_rank: Mapped[str] = mapped_column(String(20), nullable=True)
 
     emp_leave_balance: Mapped[int] = mapped_column(Integer, nullable=True)
+    # Cached running balance of leave_ledger; bumped on every ledger write for optimistic checks.
+    # 0 means no ledger entry has been written for this employee yet.
+    emp_leave_balance_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
     emp_start_date: Mapped[datetime.date] = mapped_column(Date, nullable=True)
     emp_end_date: Mapped[datetime.date] = mapped_column(Date, nullable=True)
 
     emp_status: Mapped[str] = mapped_column(String(20), nullable=True)
     emp_work_status: Mapped[str] = mapped_column(String(20), nullable=True)
 
+    # Bumped on every write, fingerprints the profile for conditional GETs
+    updated_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.datetime.now, onupdate=datetime.datetime.now, server_default=func.now()
+    )
+
 
     auth = relationship("Auth", back_populates="employee")
     attendance_records = relationship("Attendance", back_populates="employee", cascade="all, delete-orphan")
 
     leave_requests = relationship("LeaveRequest", foreign_keys="[LeaveRequest.employee_id]", back_populates="employee")
-    approved_requests = relationship("LeaveRequest", foreign_keys="[LeaveRequest.approved_by]", back_populates="approver", lazy=True)
\ No newline at end of file
+    approved_requests = relationship("LeaveRequest", foreign_keys="[LeaveRequest.approved_by]", back_populates="approver", lazy=True)
+
+    # Directory listing filters and keyset sorts
+    __table_args__ = (
+        Index("ix_employee_department", "emp_department"),
+        Index("ix_employee_first_name", "first_name", "id"),
+        Index("ix_employee_last_name", "last_name", "id"),
+    )
\ No newline at end of file
@@ -0,0 +1,173 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import select, insert
+
+from db import db
+from extensions import bcrypt
+from Authentication.models import Auth
+from EmployeeManagement.models import Employee, WorkStatusEnum
+from EmployeeManagement.roster import bump_roster
+from EmployeeManagement.search import employee_search
+
+
+REQUIRED_COLUMNS = ('email', 'password', 'first_name', 'last_name', 'phone_no', 'gender', 'address', 'country')
+OPTIONAL_COLUMNS = ('emp_department', 'emp_team', 'emp_position', 'emp_rank', 'emp_start_date')
+
+# Column lengths of Auth/Employee, checked up front so one long value cannot fail the batch
+COLUMN_LENGTHS = {
+    'email': 50, 'first_name': 80, 'last_name': 80, 'phone_no': 20, 'gender': 10, 'address': 200,
+    'country': 50, 'emp_department': 50, 'emp_team': 100, 'emp_position': 100, 'emp_rank': 20,
+}
+
+
+# Helper function to read an uploaded CSV (header row with the column names) into dicts
+def read_csv_rows(text):
+    return [dict(row) for row in csv.DictReader(io.StringIO(text))]
+
+
+# Helper function to validate and normalize one import row, raises ValueError
+def parse_import_row(row):
+    if not isinstance(row, dict):
+        raise ValueError('Row must be an object')
+    clean = {}
+    for column in REQUIRED_COLUMNS + OPTIONAL_COLUMNS:
+        value = row.get(column)
+        value = value.strip() if isinstance(value, str) else value
+        if value in (None, ''):
+            if column in REQUIRED_COLUMNS:
+                raise ValueError(f'{column} is required')
+            value = None
+        elif column != 'emp_start_date':
+            value = str(value)
+            if column in COLUMN_LENGTHS and len(value) > COLUMN_LENGTHS[column]:
+                raise ValueError(f'{column} is longer than {COLUMN_LENGTHS[column]} characters')
+        clean[column] = value
+
+    if '@' not in clean['email']:
+        raise ValueError('email is not valid')
+    if clean['emp_start_date']:
+        try:
+            clean['emp_start_date'] = datetime.strptime(str(clean['emp_start_date']), "%Y-%m-%d").date()
+        except ValueError:
+            raise ValueError('emp_start_date must be YYYY-MM-DD')
+    return clean
+
+
+# Hash every password on a thread pool. bcrypt releases the GIL while hashing,
+# so the threads run in parallel on separate cores without process start-up or pickling.
+def hash_passwords(passwords, workers=None):
+    workers = workers or os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [hashed.decode('utf-8') for hashed in pool.map(bcrypt.generate_password_hash, passwords)]
+
+
+# Onboard many employees at once:
+#   1. validate every row and check all emails with one query
+#   2. hash the accepted passwords in parallel
+#   3. insert Auth rows then Employee rows with batched INSERT ... RETURNING
+# Returns the per-row report, commits unless dry_run.
+def import_employees(rows, dry_run=False, workers=None):
+    report = [None] * len(rows)
+    accepted = {}
+    seen = set()
+    for index, row in enumerate(rows):
+        try:
+            clean = parse_import_row(row)
+        except ValueError as error:
+            report[index] = {'row': index, 'status': 'rejected', 'message': str(error)}
+            continue
+        key = clean['email'].lower()
+        if key in seen:
+            report[index] = {'row': index, 'status': 'rejected', 'email': clean['email'], 'message': 'Duplicate email in import'}
+            continue
+        seen.add(key)
+        accepted[index] = clean
+
+    emails = [clean['email'] for clean in accepted.values()]
+    existing = set(db.session.scalars(select(Auth.email).where(Auth.email.in_(emails)))) if emails else set()
+    for index in [i for i, clean in accepted.items() if clean['email'] in existing]:
+        report[index] = {'row': index, 'status': 'rejected', 'email': accepted.pop(index)['email'], 'message': 'User already exists'}
+
+    if dry_run or not accepted:
+        for index, clean in accepted.items():
+            report[index] = {'row': index, 'status': 'valid', 'email': clean['email']}
+        return report
+
+    indexes = list(accepted)
+    hashes = hash_passwords([accepted[i]['password'] for i in indexes], workers)
+
+    auth_ids = db.session.execute(
+        insert(Auth).returning(Auth.id, sort_by_parameter_order=True),
+        [{'email': accepted[i]['email'], 'password_hash': password_hash} for i, password_hash in zip(indexes, hashes)]
+    ).scalars().all()
+
+    today = date.today()
+    employee_ids = db.session.execute(
+        insert(Employee).returning(Employee.id, sort_by_parameter_order=True),
+        [
+            {
+                'auth_id': auth_id,
+                **{column: accepted[i][column] for column in REQUIRED_COLUMNS[2:]},
+                'emp_department': accepted[i]['emp_department'],
+                'emp_team': accepted[i]['emp_team'],
+                'emp_position': accepted[i]['emp_position'],
+                'emp_rank': accepted[i]['emp_rank'],
+                'emp_leave_balance': 0,
+                'emp_leave_balance_version': 0,
+                'emp_start_date': accepted[i]['emp_start_date'] or today,
+                'emp_status': 'Active',
+                'emp_work_status': WorkStatusEnum.IN_OFFICE.value,
+            }
+            for i, auth_id in zip(indexes, auth_ids)
+        ]
+    ).scalars().all()
+    db.session.commit()
+
+    for i, employee_id in zip(indexes, employee_ids):
+        report[i] = {'row': i, 'status': 'created', 'email': accepted[i]['email'], 'employee_id': employee_id}
+
+    bump_roster(*{accepted[i]['emp_department'] for i in indexes})
+    employee_search.invalidate()
+    return report
+
+
+# Helper function to count report statuses
+def summarize_report(report):
+    counts = {}
+    for entry in report:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    return counts
+
+
+employees_cli = AppGroup('employees', help='Employee maintenance.')
+
+
+@employees_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--dry-run', is_flag=True, help='Validate only, write nothing.')
+@click.option('--workers', type=int, help='Password hashing threads (default: CPU count).')
+@click.option('--report', 'report_path', type=click.Path(dir_okay=False), help='Write the per-row report as JSON here.')
+def import_command(path, dry_run, workers, report_path):
+    """Onboard employees from a CSV (header row) or JSON list file."""
+    with open(path, encoding='utf-8') as handle:
+        text = handle.read()
+    rows = json.loads(text) if path.endswith('.json') else read_csv_rows(text)
+    if not isinstance(rows, list):
+        raise click.UsageError('JSON imports must be a list of objects.')
+
+    report = import_employees(rows, dry_run=dry_run, workers=workers or current_app.config.get('IMPORT_HASH_WORKERS'))
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    for entry in report:
+        if entry['status'] == 'rejected':
+            click.echo(f"row {entry['row']}: {entry['message']}")
+    click.echo(f'{len(rows)} rows: {summarize_report(report)}')
@@ -0,0 +1,56 @@
+import time
+
+from flask import current_app
+from sqlalchemy import select
+
+from db import db
+from extensions import roster_cache
+from EmployeeManagement.models import Employee
+
+
+def version_key(department):
+    return f'version:{department}'
+
+
+# Current roster version of a department. A missing counter (first use, eviction,
+# Redis flush) is seeded from the clock so it never repeats a version used before.
+def roster_version(department):
+    version = roster_cache.get(version_key(department))
+    if version is None:
+        version = time.time_ns()
+        roster_cache.set(version_key(department), version)
+    return version
+
+
+# Call after committing changes to employees' department or status, with every
+# department affected (old and new). Cached rosters of older versions are never read again.
+def bump_roster(*departments):
+    for department in {department for department in departments if department}:
+        roster_version(department)
+        roster_cache.incr(version_key(department))
+
+
+# The department's employees, any status, as sorted [id, emp_status] pairs cached per
+# roster version, for Python-side checks such as department_headcount
+def department_roster(department):
+    key = f'roster:{department}:{roster_version(department)}'
+    roster = roster_cache.get(key)
+    if roster is None:
+        roster = [list(row) for row in db.session.execute(
+            select(Employee.id, Employee.emp_status)
+            .where(Employee.emp_department == department)
+            .order_by(Employee.id)
+        )]
+        roster_cache.set(key, roster, ttl=current_app.config['ROSTER_CACHE_TTL_SECONDS'])
+    return roster
+
+
+# Ids of the department's employees (any status) as a subquery, so department-scoped
+# queries filter in the database instead of shipping an IN (...) list of ids
+def department_member_ids(department):
+    return select(Employee.id).where(Employee.emp_department == department)
+
+
+# Helper function for the number of active employees on the roster
+def department_headcount(department):
+    return sum(status == 'Active' for _, status in department_roster(department))
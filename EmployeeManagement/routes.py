@@ -1,12 +1,19 @@
-from datetime import date
+from datetime import date, datetime
+from flask import request, current_app
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt
+from sqlalchemy import select, update
 
 from db import db
 from extensions import bcrypt, blacklist
 from Authentication.models import Auth
 from EmployeeManagement.models import Employee
-from helpers import get_current_employee, get_employee_by_id  
+from EmployeeManagement.search import employee_search
+from EmployeeManagement.roster import bump_roster
+from EmployeeManagement.onboarding import import_employees, read_csv_rows, summarize_report
+from LeaveManagement.summary import invalidate_pending_summary
+from serializers import RowSerializer, json_response
+from helpers import get_current_employee, get_employee_by_id, get_page_args, paginate_keyset, make_etag, etag_headers, not_modified
 
 employee_ns = Namespace('employees', description='Employee related operations')
 
@@ -17,7 +24,7 @@ message_model = employee_ns.model('Message', {
 # Response model
 employee_model = employee_ns.model('Employee', {
     'id': fields.Integer,
-    'email': fields.String,
+    'email': fields.String(attribute='auth.email'),
     'first_name': fields.String,
     'last_name': fields.String,
     'phone_no': fields.String,
@@ -35,6 +42,98 @@ employee_model = employee_ns.model('Employee', {
     'emp_work_status': fields.String
 })
 
+employee_page_model = employee_ns.model('EmployeePage', {
+    'items': fields.List(fields.Nested(employee_model)),
+    'next_cursor': fields.String(description='Pass as ?cursor= to fetch the next page')
+})
+
+# Query string filters of the employee listing and the columns they match
+EMPLOYEE_FILTERS = {
+    'department': Employee.emp_department,
+    'team': Employee.emp_team,
+    'status': Employee.emp_status,
+    'work_status': Employee.emp_work_status,
+    'rank': Employee.emp_rank,
+}
+
+# Sortable columns, all non-null so the keyset cursor stays exact
+EMPLOYEE_SORTS = {
+    'id': Employee.id,
+    'first_name': Employee.first_name,
+    'last_name': Employee.last_name,
+}
+
+employee_list_params = {
+    **{name: f'Only employees with this {name.replace("_", " ")}' for name in EMPLOYEE_FILTERS},
+    'sort': f'One of {", ".join(EMPLOYEE_SORTS)}; prefix with - for descending (default id)',
+    'fields': 'Comma-separated subset of fields to return, e.g. id,first_name,last_name',
+    'limit': 'Maximum number of employees per page',
+    'cursor': 'Opaque cursor returned as next_cursor by the previous page',
+}
+
+
+employee_serializer = RowSerializer(employee_model, Employee, email=Auth.email)
+
+
+# Helper function to read ?fields= into the serializer for those fields
+def get_employee_projection(value):
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    if not names:
+        return employee_serializer
+
+    unknown = [name for name in names if name not in employee_model]
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    return employee_serializer.project(names)
+
+
+search_result_model = employee_ns.model('EmployeeSearchResult', {
+    'id': fields.Integer,
+    'first_name': fields.String,
+    'last_name': fields.String,
+    'emp_department': fields.String,
+    'emp_team': fields.String,
+    'emp_position': fields.String,
+    'emp_status': fields.String,
+    'match': fields.String(enum=['prefix', 'fuzzy']),
+    'score': fields.Float
+})
+
+
+import_row_model = employee_ns.model('EmployeeImportRow', {
+    'email': fields.String(required=True),
+    'password': fields.String(required=True),
+    'first_name': fields.String(required=True),
+    'last_name': fields.String(required=True),
+    'phone_no': fields.String(required=True),
+    'gender': fields.String(required=True),
+    'address': fields.String(required=True),
+    'country': fields.String(required=True),
+    'emp_department': fields.String,
+    'emp_team': fields.String,
+    'emp_position': fields.String,
+    'emp_rank': fields.String,
+    'emp_start_date': fields.String(description='YYYY-MM-DD, defaults to today')
+})
+
+import_model = employee_ns.model('EmployeeImport', {
+    'employees': fields.List(fields.Nested(import_row_model), required=True)
+})
+
+import_result_model = employee_ns.model('EmployeeImportResult', {
+    'row': fields.Integer,
+    'status': fields.String(enum=['created', 'valid', 'rejected']),
+    'email': fields.String,
+    'employee_id': fields.Integer,
+    'message': fields.String
+})
+
+import_report_model = employee_ns.model('EmployeeImportReport', {
+    'counts': fields.Raw,
+    'results': fields.List(fields.Nested(import_result_model))
+})
+
+
 # update personal profile model
 update_model = employee_ns.model('UpdateProfile', {
     'first_name': fields.String,
@@ -56,21 +155,78 @@ hr_update_model = employee_ns.model('HRUpdate', {
 })
 
 
+bulk_update_item_model = employee_ns.model('EmployeeBulkUpdateItem', {
+    'id': fields.Integer(required=True),
+    'fields': fields.Nested(hr_update_model, required=True)
+})
+
+bulk_update_model = employee_ns.model('EmployeeBulkUpdate', {
+    'updates': fields.List(fields.Nested(bulk_update_item_model), description='Per-employee changes'),
+    'filter': fields.Raw(description=f'Or: change every employee matching these filters ({", ".join(EMPLOYEE_FILTERS)})'),
+    'fields': fields.Nested(hr_update_model, description='The changes applied to the filtered employees')
+})
+
+bulk_update_row_model = employee_ns.model('EmployeeBulkUpdateRow', {
+    'id': fields.Integer,
+    'status': fields.String(enum=['updated', 'error']),
+    'message': fields.String
+})
+
+bulk_update_result_model = employee_ns.model('EmployeeBulkUpdateResult', {
+    'updated': fields.Integer,
+    'errors': fields.Integer,
+    'results': fields.List(fields.Nested(bulk_update_row_model))
+})
+
+
+# Helper function to validate HR changes against hr_update_model, raises ValueError.
+# Returns the column values to write, with emp_end_date parsed into a date.
+def parse_hr_fields(data):
+    if not isinstance(data, dict) or not data:
+        raise ValueError('fields must be a non-empty object')
+    unknown = set(data) - set(hr_update_model.keys())
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(sorted(unknown))}')
+
+    values = {}
+    for field, value in data.items():
+        if value is not None and not isinstance(value, str):
+            raise ValueError(f'{field} must be a string or null')
+        if field == 'emp_end_date':
+            try:
+                value = datetime.strptime(value, "%Y-%m-%d").date() if value else None
+            except ValueError:
+                raise ValueError('emp_end_date must be YYYY-MM-DD')
+        else:
+            length = getattr(Employee.__table__.c[field].type, 'length', None)
+            if value is not None and length is not None and len(value) > length:
+                raise ValueError(f'{field} is longer than {length} characters')
+        values[field] = value
+    return values
+
 
 # View Personal Profile
 @employee_ns.route('/myaccount')
 class MyProfile(Resource):
     @employee_ns.doc(
-        description="Get the current employee's profile."
+        description="Get the current employee's profile. Send If-None-Match with the last ETag to get 304 when nothing changed."
     )
+    @employee_ns.response(200, 'Success', model=employee_model)
+    @employee_ns.response(304, 'Not modified')
     @jwt_required()
-    @employee_ns.marshal_with(employee_model)
     def get(self):
         claims = get_current_employee()
-        emp = get_employee_by_id(claims['emp_id'])
-        if not emp:
+        updated_at = db.session.scalar(select(Employee.updated_at).where(Employee.id == claims['emp_id']))
+        if updated_at is None:
             return {'message': 'Employee profile not found.'}, 404
-        return emp
+
+        etag = make_etag(updated_at)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        emp = get_employee_by_id(claims['emp_id'])
+        return employee_ns.marshal(emp, employee_model), 200, etag_headers(etag)
 
 # Update Personal Profile
 @employee_ns.route('/myaccount/update')
@@ -91,6 +247,7 @@ class UpdateMyProfile(Resource):
             if field in data:
                 setattr(emp, field, data[field])
         db.session.commit()
+        employee_search.update(emp)
         return {'message': 'Profile updated successfully'}
 
 
@@ -99,22 +256,119 @@ class UpdateMyProfile(Resource):
 @employee_ns.route('/')
 class AllEmployees(Resource):
     @employee_ns.doc(
-        description="Get a list of all employees."
+        description="Get a page of employees, filtered and sorted.",
+        params=employee_list_params
     )
+    @employee_ns.response(200, 'Success', model=employee_page_model)
     @jwt_required()
-    @employee_ns.marshal_list_with(employee_model)
     def get(self):
         emp = get_current_employee()
         if not emp:
             return {'message': 'Employee not found.'}, 404
 
-        if emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource':
-            return Employee.query.all()
-        elif emp['emp_rank'] == 'manager':
-            return Employee.query.filter_by(emp_department=emp['emp_department']).all()
+        query = Employee.query
+        if emp['emp_rank'] == 'manager':
+            query = query.filter(Employee.emp_department == emp['emp_department'])
+        elif not (emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource'):
+            return {'message': 'Access denied'}, 403
+
+        for name, column in EMPLOYEE_FILTERS.items():
+            value = request.args.get(name)
+            if value:
+                query = query.filter(column == value)
+
+        sort = request.args.get('sort', 'id')
+        descending = sort.startswith('-')
+        sort_column = EMPLOYEE_SORTS.get(sort.lstrip('-'))
+        if sort_column is None:
+            return {'message': f'sort must be one of {", ".join(EMPLOYEE_SORTS)}'}, 400
+
+        try:
+            serializer = get_employee_projection(request.args.get('fields'))
+        except ValueError as error:
+            return {'message': str(error)}, 400
+
+        # Selected columns plus the cursor's sort key and id; email is joined in from Auth when asked for
+        columns = serializer.columns + [
+            column for column in (sort_column, Employee.id) if not any(column is existing for existing in serializer.columns)
+        ]
+        query = query.with_entities(*columns)
+        if 'email' in serializer:
+            query = query.join(Auth, Auth.id == Employee.auth_id)
+
+        try:
+            limit, cursor = get_page_args()
+            employees, next_cursor = paginate_keyset(query, sort_column, Employee.id, cursor, limit, descending=descending)
+        except ValueError:
+            return {'message': 'Invalid cursor.'}, 400
+
+        return json_response({'items': serializer.serialize_all(employees), 'next_cursor': next_cursor})
+
+
+
+# Bulk Onboarding
+@employee_ns.route('/import')
+class ImportEmployees(Resource):
+    @employee_ns.doc(
+        description="Onboard many employees at once (HR admins only). Send JSON {\"employees\": [...]}, "
+                    "a CSV body (text/csv) or a multipart CSV upload named 'file'.",
+        params={'dry_run': 'Set to true to validate without creating anyone'}
+    )
+    @employee_ns.expect(import_model)
+    @employee_ns.response(200, 'Success', model=import_report_model)
+    @jwt_required()
+    def post(self):
+        emp = get_current_employee()
+        if not (emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource'):
+            return {'message': 'Access denied'}, 403
+
+        try:
+            if 'file' in request.files:
+                rows = read_csv_rows(request.files['file'].read().decode('utf-8-sig'))
+            elif request.mimetype == 'text/csv':
+                rows = read_csv_rows(request.get_data().decode('utf-8-sig'))
+            else:
+                body = request.get_json(silent=True)
+                rows = body.get('employees') if isinstance(body, dict) else None
+        except UnicodeDecodeError:
+            return {'message': 'CSV must be UTF-8 encoded'}, 400
+        if not isinstance(rows, list) or not rows:
+            return {'message': 'No employees to import'}, 400
+
+        max_rows = current_app.config['IMPORT_MAX_ROWS']
+        if len(rows) > max_rows:
+            return {'message': f'At most {max_rows} employees per import, use `flask employees import` for more'}, 413
+
+        dry_run = request.args.get('dry_run', '').lower() == 'true'
+        report = import_employees(rows, dry_run=dry_run, workers=current_app.config['IMPORT_HASH_WORKERS'])
+        return employee_ns.marshal({'counts': summarize_report(report), 'results': report}, import_report_model), 200
+
+
+
+# Search Employees
+@employee_ns.route('/search')
+class SearchEmployees(Resource):
+    @employee_ns.doc(
+        description="Type-ahead search over employee names, teams and positions.",
+        params={'q': 'Search text; every word must match the start of a name/team/position word, or closely resemble one',
+                'limit': 'Maximum number of results'}
+    )
+    @employee_ns.response(200, 'Success', model=[search_result_model])
+    @jwt_required()
+    def get(self):
+        emp = get_current_employee()
+        if emp['emp_rank'] == 'manager':
+            department = emp['emp_department']
+        elif emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource':
+            department = None
         else:
             return {'message': 'Access denied'}, 403
 
+        maximum = current_app.config['SEARCH_RESULTS_MAX']
+        limit = max(1, min(request.args.get('limit', default=20, type=int), maximum))
+        hits = employee_search.search(request.args.get('q', ''), limit=limit, department=department)
+        return employee_ns.marshal([{**doc, 'match': match, 'score': score} for doc, match, score in hits], search_result_model), 200
+
 
 
 # Get Employee Information by ID
@@ -158,15 +412,138 @@ class HRUpdate(Resource):
         if not (emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource'):
             return {'message': 'Access denied'}, 403
 
-        data = employee_ns.payload
-        for field in hr_update_model.keys():
-            if field in data:
-                setattr(target_emp, field, data[field])
+        try:
+            values = parse_hr_fields(employee_ns.payload)
+        except ValueError as error:
+            return {'message': str(error)}, 400
+
+        old_department = target_emp.emp_department
+        for field, value in values.items():
+            setattr(target_emp, field, value)
         db.session.commit()
+        employee_search.update(target_emp)
+        bump_roster(old_department, target_emp.emp_department)
+        if old_department != target_emp.emp_department:
+            invalidate_pending_summary()
         return {'message': 'Employee record updated successfully'}
 
 
 
+# Bulk HR Update
+@employee_ns.route('/bulk-update')
+class BulkHRUpdate(Resource):
+    @employee_ns.doc(
+        description="Update many employees in one transaction (HR admins only). Send either "
+                    "{\"updates\": [{\"id\": 1, \"fields\": {...}}]} or {\"filter\": {...}, \"fields\": {...}}."
+    )
+    @employee_ns.expect(bulk_update_model)
+    @employee_ns.response(200, 'Success', model=bulk_update_result_model)
+    @jwt_required()
+    def patch(self):
+        emp = get_current_employee()
+        if not (emp['emp_rank'] == 'admin' and emp['emp_department'] == 'Human Resource'):
+            return {'message': 'Access denied'}, 403
+
+        data = request.get_json(silent=True) or {}
+        if 'updates' in data:
+            result = self.update_by_id(data['updates'])
+        elif 'filter' in data:
+            result = self.update_by_filter(data['filter'], data.get('fields'))
+        else:
+            return {'message': 'Send either updates or filter with fields'}, 400
+        if isinstance(result, tuple):
+            return result  # validation error response
+
+        results, updated = result['results'], result['updated']
+        db.session.commit()
+
+        # Once for the whole batch: rosters of every department touched, the search index
+        # and the pending summary (grouped by department)
+        if updated:
+            bump_roster(*result['departments'])
+            employee_search.invalidate()
+            invalidate_pending_summary()
+
+        return employee_ns.marshal({
+            'updated': updated,
+            'errors': sum(row['status'] == 'error' for row in results),
+            'results': results
+        }, bulk_update_result_model), 200
+
+    # Helper function for {"updates": [...]}: validates every row, then one
+    # executemany UPDATE by primary key
+    @staticmethod
+    def update_by_id(updates):
+        if not isinstance(updates, list) or not updates:
+            return {'message': 'updates must be a non-empty list'}, 400
+        max_updates = current_app.config['EMPLOYEE_BULK_MAX_UPDATES']
+        if len(updates) > max_updates:
+            return {'message': f'At most {max_updates} updates per request'}, 413
+
+        ids = {item.get('id') for item in updates if isinstance(item, dict) and isinstance(item.get('id'), int)}
+        departments = dict(db.session.execute(
+            select(Employee.id, Employee.emp_department).where(Employee.id.in_(ids))
+        ).all()) if ids else {}
+
+        seen = set()
+        rows = []
+        results = []
+        touched = set()
+        for item in updates:
+            employee_id = item.get('id') if isinstance(item, dict) else None
+            result = {'id': employee_id if isinstance(employee_id, int) else None, 'status': 'error'}
+            results.append(result)
+
+            if not isinstance(employee_id, int):
+                result['message'] = 'Each update needs an integer id'
+                continue
+            if employee_id in seen:
+                result['message'] = 'Duplicate id in batch'
+                continue
+            seen.add(employee_id)
+            if employee_id not in departments:
+                result['message'] = 'Employee not found'
+                continue
+            try:
+                values = parse_hr_fields(item.get('fields'))
+            except ValueError as error:
+                result['message'] = str(error)
+                continue
+
+            rows.append({'id': employee_id, **values})
+            touched.add(departments[employee_id])
+            touched.add(values.get('emp_department', departments[employee_id]))
+            result.update(status='updated', message='Employee record updated successfully')
+
+        if rows:
+            db.session.execute(update(Employee), rows)
+        return {'departments': touched, 'results': results, 'updated': len(rows)}
+
+    # Helper function for {"filter": {...}, "fields": {...}}: one UPDATE ... WHERE
+    @staticmethod
+    def update_by_filter(filters, data):
+        if not isinstance(filters, dict) or not filters:
+            return {'message': 'filter must be a non-empty object'}, 400
+        unknown = set(filters) - set(EMPLOYEE_FILTERS)
+        if unknown:
+            return {'message': f'filter keys must be among {", ".join(EMPLOYEE_FILTERS)}'}, 400
+        try:
+            values = parse_hr_fields(data)
+        except ValueError as error:
+            return {'message': str(error)}, 400
+
+        conditions = [EMPLOYEE_FILTERS[name] == value for name, value in filters.items()]
+        touched = set(db.session.scalars(select(Employee.emp_department).where(*conditions).distinct()))
+        if 'emp_department' in values:
+            touched.add(values['emp_department'])
+
+        updated = db.session.execute(
+            update(Employee).where(*conditions).values(**values).execution_options(synchronize_session=False)
+        ).rowcount
+        return {'departments': touched, 'results': [], 'updated': updated}
+
+
+
 # Terminate Employee
 @employee_ns.route('/<int:id>/terminate')
 class TerminateEmployee(Resource):
@@ -185,6 +562,8 @@ class TerminateEmployee(Resource):
             return {'message': 'Access denied'}, 403
 
         target_emp.emp_status = 'Terminated'
-        target_emp.emp_end_date = date.today().isoformat()
+        target_emp.emp_end_date = date.today()
         db.session.commit()
+        employee_search.update(target_emp)
+        bump_roster(target_emp.emp_department)
         return {'message': f'Employee {target_emp.first_name} {target_emp.last_name} terminated successfully'}
@@ -0,0 +1,171 @@
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import defaultdict
+
+from sqlalchemy import select
+
+from db import db
+from EmployeeManagement.models import Employee
+
+
+# Columns searched and the ones returned with each hit
+SEARCH_COLUMNS = ('first_name', 'last_name', 'emp_team', 'emp_position')
+RESULT_COLUMNS = ('id', 'first_name', 'last_name', 'emp_department', 'emp_team', 'emp_position', 'emp_status')
+
+# Smallest trigram similarity for a fuzzy hit
+FUZZY_THRESHOLD = 0.3
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+# Helper function for the padded trigrams of a token, "ann" -> {"$an", "ann", "nn$"}
+def trigrams(token):
+    padded = f'${token}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# In-process search over employee names, teams and positions.
+#   - prefix lookups bisect a sorted array of (token, employee id)
+#   - fuzzy lookups use trigram postings (trigram -> ids) and rank by similarity
+# Updates are applied per employee by the write endpoints; the whole index is
+# rebuilt on first use and every refresh_seconds so other processes' writes show up.
+class EmployeeSearchIndex:
+    def __init__(self, refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._clear()
+
+    def _clear(self):
+        self._docs = {}
+        self._tokens = {}
+        self._prefix = []
+        self._trigrams = defaultdict(set)
+
+    def init_app(self, app):
+        self.refresh_seconds = app.config.get('SEARCH_INDEX_REFRESH_SECONDS', self.refresh_seconds)
+        with self._lock:
+            self._built_at = None
+
+    # Drop the index after bulk changes, the next search rebuilds it
+    def invalidate(self):
+        with self._lock:
+            self._built_at = None
+            self._clear()
+
+    def _ensure_fresh(self):
+        if self._built_at is None or time.monotonic() - self._built_at > self.refresh_seconds:
+            self.rebuild()
+
+    def rebuild(self):
+        columns = [getattr(Employee, name) for name in RESULT_COLUMNS]
+        rows = db.session.execute(select(*columns)).all()
+        with self._lock:
+            self._clear()
+            entries = []
+            for row in rows:
+                doc = dict(zip(RESULT_COLUMNS, row))
+                tokens = self._index_doc(doc)
+                entries.extend((token, doc['id']) for token in tokens)
+            self._prefix = sorted(entries)
+            self._built_at = time.monotonic()
+
+    # Helper function to add a document's tokens to the trigram postings, returns its tokens
+    def _index_doc(self, doc):
+        tokens = {token for name in SEARCH_COLUMNS for token in tokenize(doc.get(name))}
+        self._docs[doc['id']] = doc
+        self._tokens[doc['id']] = tokens
+        for token in tokens:
+            for gram in trigrams(token):
+                self._trigrams[gram].add(doc['id'])
+        return tokens
+
+    def _remove(self, employee_id):
+        for token in self._tokens.pop(employee_id, ()):
+            index = bisect_left(self._prefix, (token, employee_id))
+            if index < len(self._prefix) and self._prefix[index] == (token, employee_id):
+                del self._prefix[index]
+            for gram in trigrams(token):
+                postings = self._trigrams.get(gram)
+                if postings is not None:
+                    postings.discard(employee_id)
+                    if not postings:
+                        del self._trigrams[gram]
+        self._docs.pop(employee_id, None)
+
+    # Re-index one employee after a committed change
+    def update(self, employee):
+        with self._lock:
+            if self._built_at is None:
+                return  # built from the database on first search
+            self._remove(employee.id)
+            doc = {name: getattr(employee, name) for name in RESULT_COLUMNS}
+            for token in self._index_doc(doc):
+                insort(self._prefix, (token, employee.id))
+
+    # Helper function for ids with a token starting with prefix
+    def _prefix_ids(self, prefix):
+        ids = set()
+        index = bisect_left(self._prefix, (prefix,))
+        while index < len(self._prefix) and self._prefix[index][0].startswith(prefix):
+            ids.add(self._prefix[index][1])
+            index += 1
+        return ids
+
+    # Helper function for the best trigram similarity between a query token and a document
+    def _similarity(self, query_grams, employee_id):
+        best = 0.0
+        for token in self._tokens[employee_id]:
+            grams = trigrams(token)
+            best = max(best, len(query_grams & grams) / len(query_grams | grams))
+        return best
+
+    # Employees matching every query token, by prefix first then fuzzily.
+    # Returns (doc, match, score) tuples, best first.
+    def search(self, query, limit=20, department=None):
+        query_tokens = tokenize(query)
+        if not query_tokens:
+            return []
+
+        with self._lock:
+            self._ensure_fresh()
+
+            def visible(employee_id):
+                return department is None or self._docs[employee_id]['emp_department'] == department
+
+            exact = None
+            for token in query_tokens:
+                ids = self._prefix_ids(token)
+                exact = ids if exact is None else exact & ids
+            hits = [(self._docs[i], 'prefix', 1.0) for i in exact if visible(i)]
+            hits.sort(key=lambda hit: (hit[0]['last_name'].lower(), hit[0]['first_name'].lower(), hit[0]['id']))
+
+            if len(hits) < limit:
+                # Fuzzy: every query token must be similar to one of the employee's tokens
+                scores = None
+                for token in query_tokens:
+                    grams = trigrams(token)
+                    candidates = set().union(*(self._trigrams.get(gram, ()) for gram in grams))
+                    token_scores = {}
+                    for employee_id in candidates:
+                        if employee_id in exact or not visible(employee_id):
+                            continue
+                        score = self._similarity(grams, employee_id)
+                        if score >= FUZZY_THRESHOLD:
+                            token_scores[employee_id] = score
+                    scores = token_scores if scores is None else {
+                        i: min(score, token_scores[i]) for i, score in scores.items() if i in token_scores
+                    }
+                fuzzy = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+                hits.extend((self._docs[i], 'fuzzy', round(score, 3)) for i, score in fuzzy)
+
+            return hits[:limit]
+
+
+employee_search = EmployeeSearchIndex()
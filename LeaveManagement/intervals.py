@@ -0,0 +1,71 @@
+from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
+
+
+# Requests that still hold their dates
+ACTIVE_STATUSES = (LeaveStatusEnum.PENDING, LeaveStatusEnum.APPROVED)
+
+
+# Static interval tree over closed [start, end] intervals.
+# Intervals are sorted by start and laid out as an implicit balanced BST, each
+# node keeping the largest end in its subtree, so an overlap query visits
+# O(log n + k) nodes instead of scanning every interval.
+class IntervalTree:
+    def __init__(self, intervals=()):
+        self._items = sorted(intervals, key=lambda item: (item[0], item[1]))
+        self._max_end = [None] * len(self._items)
+        self._build(0, len(self._items))
+
+    def _build(self, lo, hi):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        max_end = self._items[mid][1]
+        for child in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child is not None and child > max_end:
+                max_end = child
+        self._max_end[mid] = max_end
+        return max_end
+
+    def __len__(self):
+        return len(self._items)
+
+    # Yield (start, end, payload) for every interval sharing at least one point with [start, end]
+    def overlapping(self, start, end):
+        stack = [(0, len(self._items))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            # Nothing in this subtree reaches the query
+            if self._max_end[mid] < start:
+                continue
+            stack.append((lo, mid))
+            item = self._items[mid]
+            if item[0] <= end:
+                if item[1] >= start:
+                    yield item
+                # Right subtree starts at or after item, only worth visiting if item starts in range
+                stack.append((mid + 1, hi))
+
+    def overlaps(self, start, end):
+        return next(self.overlapping(start, end), None) is not None
+
+
+# Helper function to build a tree of leave requests keyed on their dates
+def build_request_tree(requests):
+    return IntervalTree((request.start_date, request.end_date, request) for request in requests)
+
+
+# Pending or approved requests of one employee overlapping [start_date, end_date].
+# Served by ix_leave_requests_overlap (employee_id, status, start_date, end_date).
+def find_overlapping_requests(employee_id, start_date, end_date, exclude_id=None):
+    query = LeaveRequest.query.filter(
+        LeaveRequest.employee_id == employee_id,
+        LeaveRequest.status.in_(ACTIVE_STATUSES),
+        LeaveRequest.start_date <= end_date,
+        LeaveRequest.end_date >= start_date
+    )
+    if exclude_id is not None:
+        query = query.filter(LeaveRequest.id != exclude_id)
+    return query.order_by(LeaveRequest.start_date).all()
@@ -0,0 +1,164 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, func
+from sqlalchemy.orm.attributes import set_committed_value
+
+from db import db
+from EmployeeManagement.models import Employee
+from LeaveManagement.models import LeaveLedgerEntry, LedgerEntryTypeEnum
+
+
+OPENING_BALANCE_NOTE = 'Opening balance'
+
+
+# Raised when the cached balance changed between being read and being written
+class StaleBalanceError(Exception):
+    pass
+
+
+# Helper function to claim the employee's balance row for a ledger write.
+# The UPDATE only matches if the version is still the one that was read, so two
+# concurrent approvals can never both apply against the same starting balance.
+def _bump_balance(employee_id, version, new_balance):
+    result = db.session.execute(
+        update(Employee)
+        .where(Employee.id == employee_id, Employee.emp_leave_balance_version == version)
+        .values(emp_leave_balance=new_balance, emp_leave_balance_version=version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        raise StaleBalanceError(f'Leave balance of employee {employee_id} changed concurrently')
+
+
+# Append an entry for a loaded employee and move the cached balance with it.
+# Runs in the caller's transaction; raises StaleBalanceError on a concurrent write.
+def post_ledger_entry(employee, entry_type, amount, leave_request_id=None, created_by=None,
+                      note=None, reversed_entry_id=None):
+    balance = employee.emp_leave_balance or 0
+    version = employee.emp_leave_balance_version or 0
+    new_balance = balance + amount
+    _bump_balance(employee.id, version, new_balance)
+
+    now = datetime.now()
+    if version == 0 and balance:
+        # First ledger write for this employee: record what the balance was before the ledger existed
+        db.session.add(LeaveLedgerEntry(
+            employee_id=employee.id,
+            entry_type=LedgerEntryTypeEnum.ADJUSTMENT,
+            amount=balance,
+            balance_after=balance,
+            note=OPENING_BALANCE_NOTE,
+            created_at=now
+        ))
+
+    entry = LeaveLedgerEntry(
+        employee_id=employee.id,
+        entry_type=entry_type,
+        amount=amount,
+        balance_after=new_balance,
+        leave_request_id=leave_request_id,
+        reversed_entry_id=reversed_entry_id,
+        created_by=created_by,
+        note=note,
+        created_at=now
+    )
+    db.session.add(entry)
+
+    # Keep the loaded instance in step without flushing another UPDATE
+    set_committed_value(employee, 'emp_leave_balance', new_balance)
+    set_committed_value(employee, 'emp_leave_balance_version', version + 1)
+    return entry
+
+
+# Reverse a previous entry with an opposite entry pointing back at it
+def reverse_ledger_entry(entry, created_by=None, note=None):
+    employee = db.session.get(Employee, entry.employee_id)
+    return post_ledger_entry(
+        employee,
+        LedgerEntryTypeEnum.REVERSAL,
+        -entry.amount,
+        leave_request_id=entry.leave_request_id,
+        created_by=created_by,
+        note=note,
+        reversed_entry_id=entry.id
+    )
+
+
+# Balance at the end of the given day: balance_after of the last entry up to
+# then, one index seek on (employee_id, created_at). Days before the first entry
+# get the balance carried over from before the ledger: the opening adjustment's
+# balance_after, or what the first entry started from if there is none. Employees
+# without entries get their cached balance.
+def balance_as_of(employee_id, day):
+    end_of_day = datetime.combine(day + timedelta(days=1), datetime.min.time())
+    balance = db.session.scalar(
+        select(LeaveLedgerEntry.balance_after)
+        .where(LeaveLedgerEntry.employee_id == employee_id, LeaveLedgerEntry.created_at < end_of_day)
+        .order_by(LeaveLedgerEntry.created_at.desc(), LeaveLedgerEntry.id.desc())
+        .limit(1)
+    )
+    if balance is not None:
+        return balance
+
+    first = db.session.execute(
+        select(LeaveLedgerEntry.balance_after, LeaveLedgerEntry.amount, LeaveLedgerEntry.entry_type, LeaveLedgerEntry.note)
+        .where(LeaveLedgerEntry.employee_id == employee_id)
+        .order_by(LeaveLedgerEntry.created_at, LeaveLedgerEntry.id)
+        .limit(1)
+    ).first()
+    if first is not None:
+        if first.entry_type == LedgerEntryTypeEnum.ADJUSTMENT and first.note == OPENING_BALANCE_NOTE:
+            return first.balance_after
+        return first.balance_after - first.amount
+    return db.session.scalar(select(Employee.emp_leave_balance).where(Employee.id == employee_id)) or 0
+
+
+# Bring every cached balance back in line with the ledger in bulk:
+#   1. employees never written through the ledger get an opening adjustment
+#   2. cached balances that differ from SUM(amount) are overwritten
+# Returns row counts, the caller commits.
+def reconcile_balances():
+    now = datetime.now()
+    # Claim version 0 rows first so a concurrent post_ledger_entry cannot also open them
+    opened = db.session.execute(
+        update(Employee)
+        .where(
+            Employee.emp_leave_balance_version == 0,
+            Employee.emp_leave_balance.isnot(None),
+            Employee.emp_leave_balance != 0
+        )
+        .values(emp_leave_balance_version=1)
+        .returning(Employee.id, Employee.emp_leave_balance)
+        .execution_options(synchronize_session=False)
+    ).all()
+    if opened:
+        db.session.execute(LeaveLedgerEntry.__table__.insert(), [
+            {
+                'employee_id': employee_id,
+                'entry_type': LedgerEntryTypeEnum.ADJUSTMENT,
+                'amount': balance,
+                'balance_after': balance,
+                'note': OPENING_BALANCE_NOTE,
+                'created_at': now,
+            }
+            for employee_id, balance in opened
+        ])
+
+    ledger_total = (
+        select(func.coalesce(func.sum(LeaveLedgerEntry.amount), 0))
+        .where(LeaveLedgerEntry.employee_id == Employee.id)
+        .scalar_subquery()
+    )
+    corrected = db.session.execute(
+        update(Employee)
+        .where(
+            Employee.emp_leave_balance_version > 0,
+            func.coalesce(Employee.emp_leave_balance, 0) != ledger_total
+        )
+        .values(
+            emp_leave_balance=ledger_total,
+            emp_leave_balance_version=Employee.emp_leave_balance_version + 1
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return {'opened': len(opened), 'corrected': corrected}
@@ -1,7 +1,7 @@
 from datetime import datetime, date
 from enum import Enum
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Enum as SQLAlchemyEnum, Integer, Date, DateTime, Text, ForeignKey
+from sqlalchemy import Enum as SQLAlchemyEnum, Integer, String, Date, DateTime, Text, ForeignKey, Index, UniqueConstraint, func
 from db import db
 
 class LeaveTypeEnum(str, Enum):
@@ -15,6 +15,12 @@ class LeaveStatusEnum(str, Enum):
     APPROVED = 'Approved'
     REJECTED = 'Rejected'
 
+class LedgerEntryTypeEnum(str, Enum):
+    ACCRUAL = 'Accrual'
+    DEBIT = 'Debit'
+    REVERSAL = 'Reversal'
+    ADJUSTMENT = 'Adjustment'
+
 class LeaveRequest(db.Model):
     __tablename__ = "leave_requests"
 
@@ -29,10 +35,101 @@ class LeaveRequest(db.Model):
     approved_by: Mapped[int | None] = mapped_column(ForeignKey("employee.id"), nullable=True)
     approved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     rejection_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=datetime.now, onupdate=datetime.now, server_default=func.now()
+    )
 
     employee = relationship("Employee", foreign_keys=[employee_id], back_populates="leave_requests", lazy=True)
 
     approver = relationship("Employee", foreign_keys=[approved_by], back_populates="approved_requests",lazy=True)
 
+    # Support the (start_date, id) keyset scans of the listing endpoints
+    __table_args__ = (
+        Index("ix_leave_requests_employee_start", "employee_id", "start_date"),
+        Index("ix_leave_requests_status_start", "status", "start_date"),
+        Index("ix_leave_requests_overlap", "employee_id", "status", "start_date", "end_date"),
+        # count/max(updated_at) fingerprint of /leave/my-requests
+        Index("ix_leave_requests_employee_updated", "employee_id", "updated_at"),
+    )
+
     def __repr__(self):
         return f"<LeaveRequest {self.id} - {self.leave_type} ({self.status})>"
+
+
+# One row per accrual period (first day of the month); a finished run makes
+# re-running the monthly accrual for that month a no-op.
+class AccrualRun(db.Model):
+    __tablename__ = "accrual_runs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    period: Mapped[date] = mapped_column(Date, nullable=False, unique=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    rows_touched: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+    def __repr__(self):
+        return f"<AccrualRun {self.period} rows={self.rows_touched}>"
+
+
+# Append-only history of leave balance changes. amount is signed (days) and
+# balance_after is the employee's running balance once the entry is applied.
+class LeaveLedgerEntry(db.Model):
+    __tablename__ = "leave_ledger"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    employee_id: Mapped[int] = mapped_column(ForeignKey("employee.id"), nullable=False)
+    entry_type: Mapped[LedgerEntryTypeEnum] = mapped_column(SQLAlchemyEnum(LedgerEntryTypeEnum), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    balance_after: Mapped[int] = mapped_column(Integer, nullable=False)
+    leave_request_id: Mapped[int | None] = mapped_column(ForeignKey("leave_requests.id"), nullable=True)
+    reversed_entry_id: Mapped[int | None] = mapped_column(ForeignKey("leave_ledger.id"), nullable=True)
+    created_by: Mapped[int | None] = mapped_column(ForeignKey("employee.id"), nullable=True)
+    note: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+
+    __table_args__ = (
+        Index("ix_leave_ledger_employee_created", "employee_id", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<LeaveLedgerEntry {self.id} {self.entry_type} {self.amount:+d}>"
+
+
+# Public holidays per country, country stored as LeaveManagement.workdays.country_key()
+class Holiday(db.Model):
+    __tablename__ = "holidays"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    country: Mapped[str] = mapped_column(String(50), nullable=False)
+    holiday_date: Mapped[date] = mapped_column(Date, nullable=False)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("country", "holiday_date", name="unique_country_holiday"),
+    )
+
+    def __repr__(self):
+        return f"<Holiday {self.country} {self.holiday_date} {self.name}>"
+
+
+# Side effects of leave decisions, written in the decision's transaction and
+# delivered later by the tasks.leave.drain_outbox worker
+class OutboxEvent(db.Model):
+    __tablename__ = "leave_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    topic: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)  # JSON
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.now)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_leave_outbox_pending", "processed_at", "available_at"),
+    )
+
+    def __repr__(self):
+        return f"<OutboxEvent {self.id} {self.topic} attempts={self.attempts}>"
@@ -0,0 +1,109 @@
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from db import db
+from LeaveManagement.models import OutboxEvent
+
+
+logger = logging.getLogger(__name__)
+
+# topic -> handlers called with the decoded payload
+HANDLERS = defaultdict(list)
+
+
+# Decorator to register a side effect for a topic. Handlers must be idempotent:
+# an event is retried whole if any of its handlers raises.
+def outbox_handler(topic):
+    def register(func):
+        HANDLERS[topic].append(func)
+        return func
+    return register
+
+
+# Queue an event in the caller's transaction, it is only delivered if that commits
+def enqueue_event(topic, payload):
+    event = OutboxEvent(topic=topic, payload=json.dumps(payload, default=str))
+    db.session.add(event)
+    return event
+
+
+# Helper function to build the payload of a leave decision event
+def leave_decision_payload(leave_request):
+    return {
+        'request_id': leave_request.id,
+        'employee_id': leave_request.employee_id,
+        'status': leave_request.status.value,
+        'leave_type': leave_request.leave_type.value,
+        'start_date': leave_request.start_date,
+        'end_date': leave_request.end_date,
+        'days_requested': leave_request.days_requested,
+        'decided_by': leave_request.approved_by,
+        'decided_at': leave_request.approved_at,
+        'rejection_reason': leave_request.rejection_reason,
+    }
+
+
+# Queue leave.approved / leave.rejected for a decided request
+def enqueue_leave_decision(leave_request):
+    return enqueue_event(f'leave.{leave_request.status.value.lower()}', leave_decision_payload(leave_request))
+
+
+@outbox_handler('leave.approved')
+@outbox_handler('leave.rejected')
+def notify_requestor(payload):
+    # Stand-in until an email/notification provider is configured
+    logger.info('Leave request %s %s for employee %s',
+                payload['request_id'], payload['status'].lower(), payload['employee_id'])
+
+
+# Helper function for exponential backoff before the next attempt
+def backoff_delay(attempts, base_seconds, max_seconds):
+    return timedelta(seconds=min(base_seconds * 2 ** (attempts - 1), max_seconds))
+
+
+# Deliver due events in batches of batch_size, committing after each batch.
+# Failed events are retried with exponential backoff until max_attempts, then
+# left in the table with their last error for inspection. Rows are claimed with
+# FOR UPDATE SKIP LOCKED so several workers can drain concurrently on PostgreSQL.
+def drain_outbox(batch_size=100, max_attempts=8, backoff_seconds=30, backoff_max_seconds=3600, max_batches=None):
+    counts = {'delivered': 0, 'failed': 0, 'batches': 0}
+    while max_batches is None or counts['batches'] < max_batches:
+        now = datetime.now()
+        events = db.session.scalars(
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.processed_at.is_(None),
+                OutboxEvent.available_at <= now,
+                OutboxEvent.attempts < max_attempts
+            )
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not events:
+            break
+
+        for event in events:
+            try:
+                payload = json.loads(event.payload)
+                for handler in HANDLERS.get(event.topic, ()):
+                    handler(payload)
+            except Exception as error:
+                event.attempts += 1
+                event.last_error = f'{type(error).__name__}: {error}'[:2000]
+                event.available_at = now + backoff_delay(event.attempts, backoff_seconds, backoff_max_seconds)
+                counts['failed'] += 1
+                logger.warning('Outbox event %s (%s) failed, attempt %s', event.id, event.topic, event.attempts, exc_info=True)
+            else:
+                event.attempts += 1
+                event.processed_at = datetime.now()
+                event.last_error = None
+                counts['delivered'] += 1
+
+        db.session.commit()
+        counts['batches'] += 1
+    return counts
@@ -1,12 +1,22 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required
-from flask import request
-from datetime import datetime
-
-from db import db
-from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
-from EmployeeManagement.models import Employee
-from helpers import get_current_employee  
+from flask import request, current_app
+from datetime import datetime, timedelta, MINYEAR, MAXYEAR
+
+from sqlalchemy import delete, or_, select, func
+
+from db import db, upsert_insert
+from LeaveManagement.models import LeaveRequest, LeaveStatusEnum, LeaveLedgerEntry, LedgerEntryTypeEnum, Holiday
+from LeaveManagement.ledger import StaleBalanceError, post_ledger_entry, reverse_ledger_entry, balance_as_of
+from LeaveManagement.intervals import ACTIVE_STATUSES, build_request_tree, find_overlapping_requests
+from LeaveManagement.coverage import department_coverage
+from LeaveManagement.workdays import working_calendars, country_key
+from LeaveManagement.outbox import enqueue_leave_decision
+from LeaveManagement.summary import get_pending_groups, summarize_pending, invalidate_pending_summary
+from EmployeeManagement.models import Employee, WorkStatusEnum
+from EmployeeManagement.roster import department_member_ids
+from serializers import RowSerializer, json_response
+from helpers import get_current_employee, get_page_args, paginate_keyset, parse_date_arg, make_etag, etag_headers, not_modified
 
 leave_ns = Namespace('leave', description='Leave management')
 
@@ -36,6 +46,184 @@ status_update_model = leave_ns.model('StatusUpdate', {
     'rejection_reason': fields.String(required=False)
 })
 
+leave_request_serializer = RowSerializer(leave_request_model, LeaveRequest)
+
+leave_page_model = leave_ns.model('LeaveRequestPage', {
+    'items': fields.List(fields.Nested(leave_request_model)),
+    'next_cursor': fields.String(description='Pass as ?cursor= to fetch the next page')
+})
+
+page_params = {
+    'limit': 'Maximum number of requests per page',
+    'cursor': 'Opaque cursor returned as next_cursor by the previous page',
+}
+
+ledger_entry_model = leave_ns.model('LeaveLedgerEntry', {
+    'id': fields.Integer,
+    'employee_id': fields.Integer,
+    'entry_type': fields.String(enum=['Accrual', 'Debit', 'Reversal', 'Adjustment'], attribute='entry_type.value'),
+    'amount': fields.Integer,
+    'balance_after': fields.Integer,
+    'leave_request_id': fields.Integer,
+    'reversed_entry_id': fields.Integer,
+    'created_by': fields.Integer,
+    'note': fields.String,
+    'created_at': fields.String
+})
+
+ledger_page_model = leave_ns.model('LeaveLedgerPage', {
+    'items': fields.List(fields.Nested(ledger_entry_model)),
+    'next_cursor': fields.String(description='Pass as ?cursor= to fetch the next page')
+})
+
+adjustment_input_model = leave_ns.model('LedgerAdjustmentInput', {
+    'amount': fields.Integer(required=True, description='Signed number of days to add to the balance'),
+    'note': fields.String(required=True)
+})
+
+reversal_input_model = leave_ns.model('LedgerReversalInput', {
+    'note': fields.String(required=False)
+})
+
+STALE_BALANCE_MESSAGE = 'Leave balance was changed by another request, please retry.'
+
+conflict_model = leave_ns.model('LeaveConflict', {
+    'id': fields.Integer,
+    'employee_id': fields.Integer,
+    'start_date': fields.String,
+    'end_date': fields.String,
+    'status': fields.String(attribute='status.value')
+})
+
+request_conflicts_model = leave_ns.model('LeaveRequestConflicts', {
+    'request_id': fields.Integer,
+    'own_overlaps': fields.List(fields.Nested(conflict_model)),
+    'department_overlaps': fields.List(fields.Nested(conflict_model))
+})
+
+department_conflicts_model = leave_ns.model('DepartmentLeaveConflicts', {
+    'request_id': fields.Integer,
+    'employee_id': fields.Integer,
+    'start_date': fields.String,
+    'end_date': fields.String,
+    'conflicts': fields.List(fields.Nested(conflict_model))
+})
+
+
+coverage_person_model = leave_ns.model('CoveragePerson', {
+    'employee_id': fields.Integer,
+    'name': fields.String,
+    'status': fields.String,
+    'request_id': fields.Integer
+})
+
+coverage_day_model = leave_ns.model('CoverageDay', {
+    'date': fields.String,
+    'out_count': fields.Integer,
+    'approved': fields.Integer,
+    'pending': fields.Integer,
+    'people': fields.List(fields.Nested(coverage_person_model))
+})
+
+coverage_model = leave_ns.model('Coverage', {
+    'department': fields.String,
+    'headcount': fields.Integer,
+    'days': fields.List(fields.Nested(coverage_day_model))
+})
+
+
+decision_model = leave_ns.model('LeaveDecision', {
+    'id': fields.Integer(required=True),
+    'decision': fields.String(required=True, enum=['approve', 'reject']),
+    'rejection_reason': fields.String(required=False)
+})
+
+bulk_decision_model = leave_ns.model('LeaveBulkDecision', {
+    'decisions': fields.List(fields.Nested(decision_model), required=True),
+    'rejection_reason': fields.String(required=False, description='Default reason for rejections without their own')
+})
+
+decision_result_model = leave_ns.model('LeaveDecisionResult', {
+    'id': fields.Integer,
+    'status': fields.String(enum=['approved', 'rejected', 'error']),
+    'message': fields.String
+})
+
+bulk_decision_result_model = leave_ns.model('LeaveBulkDecisionResult', {
+    'approved': fields.Integer,
+    'rejected': fields.Integer,
+    'errors': fields.Integer,
+    'results': fields.List(fields.Nested(decision_result_model))
+})
+
+DECISION_ACTIONS = {'approve': LeaveStatusEnum.APPROVED, 'reject': LeaveStatusEnum.REJECTED}
+
+
+holiday_model = leave_ns.model('Holiday', {
+    'country': fields.String,
+    'date': fields.String(attribute='holiday_date'),
+    'name': fields.String
+})
+
+holiday_entry_model = leave_ns.model('HolidayEntry', {
+    'date': fields.String(required=True, description='YYYY-MM-DD'),
+    'name': fields.String(required=True)
+})
+
+holiday_upload_model = leave_ns.model('HolidayUpload', {
+    'country': fields.String(required=True, description='Matched against Employee.country, case-insensitive'),
+    'holidays': fields.List(fields.Nested(holiday_entry_model), required=True),
+    'replace': fields.Boolean(default=True, description='Replace the existing holidays of the uploaded years')
+})
+
+
+pending_department_model = leave_ns.model('PendingByDepartment', {
+    'department': fields.String,
+    'count': fields.Integer,
+    'earliest_start_date': fields.String
+})
+
+pending_leave_type_model = leave_ns.model('PendingByLeaveType', {
+    'leave_type': fields.String,
+    'count': fields.Integer
+})
+
+pending_summary_model = leave_ns.model('PendingSummary', {
+    'total': fields.Integer,
+    'earliest_start_date': fields.String,
+    'by_department': fields.List(fields.Nested(pending_department_model)),
+    'by_leave_type': fields.List(fields.Nested(pending_leave_type_model))
+})
+
+
+# Helper function for the response when new dates collide with the employee's own requests
+def overlap_response(conflicts):
+    return {
+        'message': 'Leave dates overlap an existing pending or approved request',
+        'conflicts': leave_ns.marshal(conflicts, conflict_model)
+    }, 409
+
+
+# Helper function to apply the department/rank rules shared by approve and reject.
+# Returns why the reviewer may not decide, None when they may.
+def review_denied(claims, requestor, action):
+    if claims['emp_rank'] == 'manager':
+        if requestor.emp_department != claims['emp_department']:
+            return f'Managers can only {action} requests from their department'
+    elif claims['emp_rank'] == 'admin':
+        if requestor.emp_rank != 'admin':
+            return f'Admins can only {action} other admins'
+    else:
+        return 'Access denied'
+    return None
+
+
+# Helper function to check a manager/admin may look at requests of the given department
+def can_review_department(claims, department):
+    if claims['emp_rank'] == 'manager':
+        return department == claims['emp_department']
+    return claims['emp_rank'] == 'admin'
+
 
 
 
@@ -58,12 +246,22 @@ class LeaveRequestSubmit(Resource):
         if end_date < start_date:
             return {'message': 'End date must be after start date.'}, 400
 
-        days_requested = (end_date - start_date).days + 1
-
         employee = Employee.query.get(claims['emp_id'])
-        if not employee or (employee.emp_leave_balance or 0) < days_requested:
+        if not employee:
+            return {'message': 'Employee not found'}, 404
+
+        # Only working days of the employee's country are charged
+        days_requested = working_calendars.get(employee.country).working_days(start_date, end_date)
+        if days_requested == 0:
+            return {'message': 'Requested dates contain no working days.'}, 400
+
+        if (employee.emp_leave_balance or 0) < days_requested:
             return {'message': 'Insufficient leave balance'}, 400
 
+        conflicts = find_overlapping_requests(employee.id, start_date, end_date)
+        if conflicts:
+            return overlap_response(conflicts)
+
         new_request = LeaveRequest(
             employee_id=employee.id,
             leave_type=data['leave_type'],
@@ -75,6 +273,7 @@ class LeaveRequestSubmit(Resource):
         )
         db.session.add(new_request)
         db.session.commit()
+        invalidate_pending_summary()
 
         return {'message': 'Leave request submitted'}, 201
 
@@ -82,13 +281,32 @@ class LeaveRequestSubmit(Resource):
 
 @leave_ns.route('/my-requests')
 class MyLeaveRequests(Resource):
-    @leave_ns.doc(description='Get my leave requests')
+    @leave_ns.doc(description='Get my leave requests. Send If-None-Match with the last ETag to get 304 when nothing changed.', params=page_params)
+    @leave_ns.response(200, 'Success', model=leave_page_model)
+    @leave_ns.response(304, 'Not modified')
     @jwt_required()
     def get(self):
         claims = get_current_employee()
-        requests = LeaveRequest.query.filter_by(employee_id=claims['emp_id']) \
-                                     .order_by(LeaveRequest.start_date.desc()).all()
-        return leave_ns.marshal(requests, leave_request_model), 200
+        query = LeaveRequest.query.with_entities(*leave_request_serializer.columns).filter_by(employee_id=claims['emp_id'])
+
+        # Covered by ix_leave_requests_employee_updated; deletes change the count
+        fingerprint = db.session.execute(
+            select(func.count(LeaveRequest.id), func.max(LeaveRequest.updated_at))
+            .where(LeaveRequest.employee_id == claims['emp_id'])
+        ).one()
+        etag = make_etag(*fingerprint)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        try:
+            limit, cursor = get_page_args()
+            requests, next_cursor = paginate_keyset(query, LeaveRequest.start_date, LeaveRequest.id, cursor, limit)
+        except ValueError:
+            return {'message': 'Invalid cursor.'}, 400
+
+        body = {'items': leave_request_serializer.serialize_all(requests), 'next_cursor': next_cursor}
+        return json_response(body, headers=etag_headers(etag))
 
 
 @leave_ns.route('/<int:id>/edit')
@@ -118,13 +336,22 @@ class EditLeaveRequest(Resource):
         if end_date < start_date:
             return {'message': 'End date must be after start date.'}, 400
 
-        days_requested = (end_date - start_date).days + 1
-
         employee = Employee.query.get(claims['emp_id'])
-        if not employee or (employee.emp_leave_balance or 0) + leave_request.days_requested < days_requested:
+        if not employee:
+            return {'message': 'Employee not found'}, 404
+
+        days_requested = working_calendars.get(employee.country).working_days(start_date, end_date)
+        if days_requested == 0:
+            return {'message': 'Requested dates contain no working days.'}, 400
+
+        if (employee.emp_leave_balance or 0) + leave_request.days_requested < days_requested:
             # Add back old days_requested before checking balance
             return {'message': 'Insufficient leave balance for updated dates'}, 400
 
+        conflicts = find_overlapping_requests(employee.id, start_date, end_date, exclude_id=leave_request.id)
+        if conflicts:
+            return overlap_response(conflicts)
+
         # Update the leave request fields
         leave_request.leave_type = data['leave_type']
         leave_request.start_date = start_date
@@ -133,6 +360,7 @@ class EditLeaveRequest(Resource):
         leave_request.reason = data['reason']
 
         db.session.commit()
+        invalidate_pending_summary()
         return {'message': 'Leave request updated successfully'}, 200
 
 
@@ -154,6 +382,7 @@ class DeleteLeaveRequest(Resource):
 
         db.session.delete(leave_request)
         db.session.commit()
+        invalidate_pending_summary()
 
         return {'message': 'Leave request deleted successfully'}, 200
 
@@ -161,31 +390,161 @@ class DeleteLeaveRequest(Resource):
 
 @leave_ns.route('/pending')
 class PendingRequests(Resource):
-    @leave_ns.doc(description='Get pending leave requests')
+    @leave_ns.doc(description='Get pending leave requests', params=page_params)
+    @leave_ns.response(200, 'Success', model=leave_page_model)
     @jwt_required()
     def get(self):
         claims = get_current_employee()
         if claims['emp_rank'] not in ['manager', 'admin']:
             return {'message': 'Access denied'}, 403
 
-        query = LeaveRequest.query.join(Employee)
+        query = LeaveRequest.query.with_entities(*leave_request_serializer.columns).filter(
+            LeaveRequest.status == LeaveStatusEnum.PENDING
+        )
 
         if claims['emp_rank'] == 'manager':
-            query = query.filter(
-                Employee.emp_department == claims['emp_department'],
-                LeaveRequest.status == LeaveStatusEnum.PENDING
+            query = query.filter(LeaveRequest.employee_id.in_(department_member_ids(claims['emp_department'])))
+
+        try:
+            limit, cursor = get_page_args()
+            results, next_cursor = paginate_keyset(query, LeaveRequest.start_date, LeaveRequest.id, cursor, limit)
+        except ValueError:
+            return {'message': 'Invalid cursor.'}, 400
+
+        return json_response({'items': leave_request_serializer.serialize_all(results), 'next_cursor': next_cursor})
+
+
+
+@leave_ns.route('/pending/summary')
+class PendingSummary(Resource):
+    @leave_ns.doc(description='Counts of pending leave requests by department and leave type')
+    @leave_ns.response(200, 'Success', model=pending_summary_model)
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] not in ['manager', 'admin']:
+            return {'message': 'Access denied'}, 403
+
+        # Managers see their department, same as /pending
+        department = claims['emp_department'] if claims['emp_rank'] == 'manager' else None
+        return summarize_pending(get_pending_groups(), department), 200
+
+
+@leave_ns.route('/<int:id>/conflicts')
+class LeaveRequestConflicts(Resource):
+    @leave_ns.doc(description='List pending or approved requests overlapping this one')
+    @leave_ns.response(200, 'Success', model=request_conflicts_model)
+    @jwt_required()
+    def get(self, id):
+        claims = get_current_employee()
+        leave_request = LeaveRequest.query.get_or_404(id)
+        requestor = Employee.query.get(leave_request.employee_id)
+
+        if not can_review_department(claims, requestor.emp_department):
+            return {'message': 'Access denied'}, 403
+
+        own = find_overlapping_requests(requestor.id, leave_request.start_date, leave_request.end_date, exclude_id=leave_request.id)
+        colleagues = LeaveRequest.query.filter(
+            LeaveRequest.employee_id.in_(department_member_ids(requestor.emp_department)),
+            LeaveRequest.employee_id != requestor.id,
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            LeaveRequest.start_date <= leave_request.end_date,
+            LeaveRequest.end_date >= leave_request.start_date
+        ).order_by(LeaveRequest.start_date).all()
+
+        return leave_ns.marshal({
+            'request_id': leave_request.id,
+            'own_overlaps': own,
+            'department_overlaps': colleagues
+        }, request_conflicts_model), 200
+
+
+@leave_ns.route('/conflicts')
+class DepartmentConflicts(Resource):
+    @leave_ns.doc(description='Pending requests of a department and the pending or approved requests they overlap', params={
+        'department': 'Department to plan (managers: defaults to their own)',
+        'from': 'Only requests ending on or after this day (YYYY-MM-DD), default today',
+        'to': 'Only requests starting on or before this day (YYYY-MM-DD)'
+    })
+    @leave_ns.response(200, 'Success', model=[department_conflicts_model])
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        department = request.args.get('department') or claims['emp_department']
+        if claims['emp_rank'] not in ['manager', 'admin'] or not can_review_department(claims, department):
+            return {'message': 'Access denied'}, 403
+
+        try:
+            date_from = parse_date_arg(request.args.get('from')) or datetime.today().date()
+            date_to = parse_date_arg(request.args.get('to'))
+        except ValueError:
+            return {'message': 'Invalid date format. Use YYYY-MM-DD.'}, 400
+
+        # One range query for the department, then every pending request is checked against an interval tree
+        query = LeaveRequest.query.filter(
+            LeaveRequest.employee_id.in_(department_member_ids(department)),
+            LeaveRequest.status.in_(ACTIVE_STATUSES),
+            LeaveRequest.end_date >= date_from
+        )
+        if date_to:
+            query = query.filter(LeaveRequest.start_date <= date_to)
+        requests = query.all()
+        tree = build_request_tree(requests)
+
+        results = []
+        for leave_request in sorted(requests, key=lambda r: (r.start_date, r.id)):
+            if leave_request.status != LeaveStatusEnum.PENDING:
+                continue
+            conflicts = sorted(
+                (other for _, _, other in tree.overlapping(leave_request.start_date, leave_request.end_date) if other.id != leave_request.id),
+                key=lambda r: (r.start_date, r.id)
             )
-        else:  # admin
-            query = query.filter(LeaveRequest.status == LeaveStatusEnum.PENDING)
+            if conflicts:
+                results.append({
+                    'request_id': leave_request.id,
+                    'employee_id': leave_request.employee_id,
+                    'start_date': leave_request.start_date,
+                    'end_date': leave_request.end_date,
+                    'conflicts': conflicts
+                })
+
+        return leave_ns.marshal(results, department_conflicts_model), 200
+
+
+@leave_ns.route('/coverage')
+class DepartmentCoverage(Resource):
+    @leave_ns.doc(description='Per-day count and names of people on approved or pending leave', params={
+        'department': 'Department to show (managers: defaults to their own)',
+        'from': 'First day (YYYY-MM-DD), default today',
+        'to': 'Last day (YYYY-MM-DD), default a month from the first day'
+    })
+    @leave_ns.response(200, 'Success', model=coverage_model)
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        department = request.args.get('department') or claims['emp_department']
+        if claims['emp_rank'] not in ['manager', 'admin'] or not can_review_department(claims, department):
+            return {'message': 'Access denied'}, 403
+
+        try:
+            date_from = parse_date_arg(request.args.get('from')) or datetime.today().date()
+            date_to = parse_date_arg(request.args.get('to')) or date_from + timedelta(days=current_app.config['COVERAGE_DEFAULT_DAYS'] - 1)
+        except ValueError:
+            return {'message': 'Invalid date format. Use YYYY-MM-DD.'}, 400
 
-        results = query.order_by(LeaveRequest.start_date.desc()).all()
-        return leave_ns.marshal(results, leave_request_model), 200
+        if date_to < date_from:
+            return {'message': 'End date must be after start date.'}, 400
+        if (date_to - date_from).days >= current_app.config['COVERAGE_MAX_DAYS']:
+            return {'message': f"Coverage is limited to {current_app.config['COVERAGE_MAX_DAYS']} days."}, 400
 
+        return department_coverage(department, date_from, date_to), 200
 
 
 @leave_ns.route('/<int:id>/approve')
 class ApproveRequest(Resource):
-    @leave_ns.doc(description='Approve a leave request')
+    @leave_ns.doc(description='Approve a leave request', params={
+        'include_coverage': 'Set to true to return department coverage over the approved dates'
+    })
     @jwt_required()
     def put(self, id):
         claims = get_current_employee()
@@ -196,21 +555,33 @@ class ApproveRequest(Resource):
 
         requestor = Employee.query.get(request_obj.employee_id)
 
-        if claims['emp_rank'] == 'manager':
-            if requestor.emp_department != claims['emp_department']:
-                return {'message': 'Managers can only approve requests from their department'}, 403
-        elif claims['emp_rank'] == 'admin':
-            if requestor.emp_rank != 'admin':
-                return {'message': 'Admins can only approve other admins'}, 403
-        else:
-            return {'message': 'Access denied'}, 403
+        denied = review_denied(claims, requestor, 'approve')
+        if denied:
+            return {'message': denied}, 403
 
         request_obj.status = LeaveStatusEnum.APPROVED
         request_obj.approved_by = claims['emp_id']
         request_obj.approved_at = datetime.now()
 
-        requestor.emp_leave_balance -= request_obj.days_requested
+        try:
+            post_ledger_entry(
+                requestor,
+                LedgerEntryTypeEnum.DEBIT,
+                -request_obj.days_requested,
+                leave_request_id=request_obj.id,
+                created_by=claims['emp_id']
+            )
+        except StaleBalanceError:
+            db.session.rollback()
+            return {'message': STALE_BALANCE_MESSAGE}, 409
+
+        enqueue_leave_decision(request_obj)
         db.session.commit()
+        invalidate_pending_summary()
+
+        if request.args.get('include_coverage', '').lower() == 'true':
+            coverage = department_coverage(requestor.emp_department, request_obj.start_date, request_obj.end_date)
+            return {'message': 'Leave approved', 'coverage': coverage}, 200
         return {'message': 'Leave approved'}, 200
 
 
@@ -230,24 +601,109 @@ class RejectRequest(Resource):
 
         requestor = Employee.query.get(request_obj.employee_id)
 
-        if claims['emp_rank'] == 'manager':
-            if requestor.emp_department != claims['emp_department']:
-                return {'message': 'Managers can only reject requests from their department'}, 403
-        elif claims['emp_rank'] == 'admin':
-            if requestor.emp_rank != 'admin':
-                return {'message': 'Admins can only reject other admins'}, 403
-        else:
-            return {'message': 'Access denied'}, 403
+        denied = review_denied(claims, requestor, 'reject')
+        if denied:
+            return {'message': denied}, 403
 
         request_obj.status = LeaveStatusEnum.REJECTED
         request_obj.rejection_reason = data.get('rejection_reason')
         request_obj.approved_by = claims['emp_id']
         request_obj.approved_at = datetime.now()
 
+        enqueue_leave_decision(request_obj)
         db.session.commit()
+        invalidate_pending_summary()
         return {'message': 'Leave rejected'}, 200
 
 
+@leave_ns.route('/bulk-decision')
+class BulkDecision(Resource):
+    @leave_ns.doc(description='Approve or reject many leave requests in one transaction')
+    @leave_ns.response(200, 'Success', model=bulk_decision_result_model)
+    @jwt_required()
+    @leave_ns.expect(bulk_decision_model)
+    def post(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] not in ['manager', 'admin']:
+            return {'message': 'Access denied'}, 403
+
+        data = request.json or {}
+        decisions = data.get('decisions')
+        if not isinstance(decisions, list) or not decisions:
+            return {'message': 'decisions must be a non-empty list'}, 400
+        max_decisions = current_app.config['LEAVE_BULK_MAX_DECISIONS']
+        if len(decisions) > max_decisions:
+            return {'message': f'At most {max_decisions} decisions per request'}, 413
+
+        # Two queries for the whole batch: the requests, then their requestors
+        ids = {item.get('id') for item in decisions if isinstance(item, dict) and isinstance(item.get('id'), int)}
+        requests = {r.id: r for r in LeaveRequest.query.filter(LeaveRequest.id.in_(ids)).all()} if ids else {}
+        requestor_ids = {r.employee_id for r in requests.values()}
+        requestors = {e.id: e for e in Employee.query.filter(Employee.id.in_(requestor_ids)).all()} if requestor_ids else {}
+
+        now = datetime.now()
+        seen = set()
+        results = []
+        for item in decisions:
+            request_id = item.get('id') if isinstance(item, dict) else None
+            action = item.get('decision') if isinstance(item, dict) else None
+            result = {'id': request_id if isinstance(request_id, int) else None, 'status': 'error'}
+            results.append(result)
+
+            if not isinstance(request_id, int) or action not in DECISION_ACTIONS:
+                result['message'] = 'Each decision needs an integer id and a decision of "approve" or "reject"'
+                continue
+            if request_id in seen:
+                result['message'] = 'Duplicate id in batch'
+                continue
+            seen.add(request_id)
+
+            request_obj = requests.get(request_id)
+            if not request_obj:
+                result['message'] = 'Leave request not found'
+                continue
+            if request_obj.status != LeaveStatusEnum.PENDING:
+                result['message'] = 'Leave request already processed'
+                continue
+            requestor = requestors[request_obj.employee_id]
+            denied = review_denied(claims, requestor, action)
+            if denied:
+                result['message'] = denied
+                continue
+
+            request_obj.status = DECISION_ACTIONS[action]
+            request_obj.approved_by = claims['emp_id']
+            request_obj.approved_at = now
+            if action == 'approve':
+                try:
+                    post_ledger_entry(
+                        requestor,
+                        LedgerEntryTypeEnum.DEBIT,
+                        -request_obj.days_requested,
+                        leave_request_id=request_obj.id,
+                        created_by=claims['emp_id']
+                    )
+                except StaleBalanceError:
+                    db.session.rollback()
+                    return {'message': STALE_BALANCE_MESSAGE}, 409
+                result.update(status='approved', message='Leave approved')
+            else:
+                request_obj.rejection_reason = item.get('rejection_reason', data.get('rejection_reason'))
+                result.update(status='rejected', message='Leave rejected')
+            enqueue_leave_decision(request_obj)
+
+        db.session.commit()
+        invalidate_pending_summary()
+
+        counts = {status: sum(r['status'] == status for r in results) for status in ('approved', 'rejected', 'error')}
+        return leave_ns.marshal({
+            'approved': counts['approved'],
+            'rejected': counts['rejected'],
+            'errors': counts['error'],
+            'results': results
+        }, bulk_decision_result_model), 200
+
+
 @leave_ns.route('/start')
 class StartLeave(Resource):
     @leave_ns.doc(description='Start a leave request')
@@ -261,7 +717,7 @@ class StartLeave(Resource):
         if not employee:
             return {"message": "Employee not found."}, 404
 
-        if employee.emp_work_status == 'On leave':
+        if employee.emp_work_status == WorkStatusEnum.ON_LEAVE.value:
             return {"message": "You are already on leave."}, 400
 
         approved_leave = LeaveRequest.query.filter_by(
@@ -273,7 +729,7 @@ class StartLeave(Resource):
         if not approved_leave:
             return {"message": "No approved leave starting today."}, 400
 
-        employee.emp_work_status = 'On leave'
+        employee.emp_work_status = WorkStatusEnum.ON_LEAVE.value
         db.session.commit()
 
         return {"message": "Leave started. Your status has been updated to 'on leave'."}, 200
@@ -282,9 +738,175 @@ class StartLeave(Resource):
 
 @leave_ns.route('/balance')
 class LeaveBalance(Resource):
-    @leave_ns.doc(description='Get leave balance')
+    @leave_ns.doc(description='Get leave balance. Send If-None-Match with the last ETag to get 304 when nothing changed.',
+                  params={'at': 'Balance at the end of this day (YYYY-MM-DD)'})
+    @leave_ns.response(304, 'Not modified')
     @jwt_required()
     def get(self):
         claims = get_current_employee()
-        employee = Employee.query.get(claims['emp_id'])
-        return {'leave_balance': employee.emp_leave_balance or 0}, 200
+
+        at = request.args.get('at')
+        try:
+            day = parse_date_arg(at)
+        except ValueError:
+            return {'message': 'Invalid date format. Use YYYY-MM-DD.'}, 400
+
+        # Every ledger write bumps the version, so it covers historical balances too
+        version, balance = db.session.execute(
+            select(Employee.emp_leave_balance_version, Employee.emp_leave_balance).where(Employee.id == claims['emp_id'])
+        ).one()
+        etag = make_etag(version, balance)
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
+        if day:
+            return {'leave_balance': balance_as_of(claims['emp_id'], day), 'as_of': str(day)}, 200, etag_headers(etag)
+        return {'leave_balance': balance or 0}, 200, etag_headers(etag)
+
+
+@leave_ns.route('/ledger')
+class LeaveLedger(Resource):
+    @leave_ns.doc(description='Get leave balance history', params={
+        'employee_id': 'Employee to show (HR admins only, defaults to yourself)', **page_params
+    })
+    @leave_ns.response(200, 'Success', model=ledger_page_model)
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        employee_id = request.args.get('employee_id', type=int) or claims['emp_id']
+
+        if employee_id != claims['emp_id'] and (claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource'):
+            return {'message': 'Access denied'}, 403
+
+        query = LeaveLedgerEntry.query.filter_by(employee_id=employee_id)
+        try:
+            limit, cursor = get_page_args()
+            entries, next_cursor = paginate_keyset(query, LeaveLedgerEntry.id, LeaveLedgerEntry.id, cursor, limit)
+        except ValueError:
+            return {'message': 'Invalid cursor.'}, 400
+
+        return {'items': leave_ns.marshal(entries, ledger_entry_model), 'next_cursor': next_cursor}, 200
+
+
+@leave_ns.route('/ledger/<int:employee_id>/adjust')
+class AdjustLeaveBalance(Resource):
+    @leave_ns.doc(description='Manually adjust an employee leave balance (HR admins only)')
+    @jwt_required()
+    @leave_ns.expect(adjustment_input_model)
+    def post(self, employee_id):
+        claims = get_current_employee()
+        if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
+            return {'message': 'Access denied'}, 403
+
+        data = request.json or {}
+        amount = data.get('amount')
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount == 0 or not data.get('note'):
+            return {'message': 'A non-zero integer amount and a note are required.'}, 400
+
+        employee = Employee.query.get_or_404(employee_id)
+        try:
+            entry = post_ledger_entry(
+                employee,
+                LedgerEntryTypeEnum.ADJUSTMENT,
+                amount,
+                created_by=claims['emp_id'],
+                note=data['note']
+            )
+        except StaleBalanceError:
+            db.session.rollback()
+            return {'message': STALE_BALANCE_MESSAGE}, 409
+
+        db.session.commit()
+        return {'message': 'Leave balance adjusted', 'entry_id': entry.id, 'leave_balance': entry.balance_after}, 201
+
+
+@leave_ns.route('/ledger/entries/<int:entry_id>/reverse')
+class ReverseLedgerEntry(Resource):
+    @leave_ns.doc(description='Reverse a leave ledger entry (HR admins only)')
+    @jwt_required()
+    @leave_ns.expect(reversal_input_model)
+    def post(self, entry_id):
+        claims = get_current_employee()
+        if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
+            return {'message': 'Access denied'}, 403
+
+        entry = LeaveLedgerEntry.query.get_or_404(entry_id)
+        if entry.entry_type == LedgerEntryTypeEnum.REVERSAL:
+            return {'message': 'Reversal entries cannot be reversed'}, 400
+        if LeaveLedgerEntry.query.filter_by(reversed_entry_id=entry.id).first():
+            return {'message': 'Ledger entry already reversed'}, 400
+
+        data = request.json or {}
+        try:
+            reversal = reverse_ledger_entry(entry, created_by=claims['emp_id'], note=data.get('note'))
+        except StaleBalanceError:
+            db.session.rollback()
+            return {'message': STALE_BALANCE_MESSAGE}, 409
+
+        db.session.commit()
+        return {'message': 'Ledger entry reversed', 'entry_id': reversal.id, 'leave_balance': reversal.balance_after}, 201
+
+
+@leave_ns.route('/holidays')
+class Holidays(Resource):
+    @leave_ns.doc(description='List public holidays', params={
+        'country': 'Country to list (defaults to your own)',
+        'year': 'Only this year'
+    })
+    @leave_ns.response(200, 'Success', model=[holiday_model])
+    @jwt_required()
+    def get(self):
+        claims = get_current_employee()
+        country = request.args.get('country')
+        if not country:
+            employee = Employee.query.get(claims['emp_id'])
+            country = employee.country if employee else ''
+
+        query = Holiday.query.filter_by(country=country_key(country))
+        year = request.args.get('year', type=int)
+        if year is not None:
+            if not MINYEAR <= year <= MAXYEAR:
+                return {'message': f'year must be between {MINYEAR} and {MAXYEAR}'}, 400
+            query = query.filter(Holiday.holiday_date >= datetime(year, 1, 1).date(), Holiday.holiday_date <= datetime(year, 12, 31).date())
+
+        return leave_ns.marshal(query.order_by(Holiday.holiday_date).all(), holiday_model), 200
+
+    @leave_ns.doc(description='Upload a set of public holidays for a country (HR admins only)')
+    @jwt_required()
+    @leave_ns.expect(holiday_upload_model)
+    def post(self):
+        claims = get_current_employee()
+        if claims['emp_rank'] != 'admin' or claims['emp_department'] != 'Human Resource':
+            return {'message': 'Access denied'}, 403
+
+        data = request.json or {}
+        country = country_key(data.get('country'))
+        if not country or not isinstance(data.get('holidays'), list):
+            return {'message': 'country and a list of holidays are required'}, 400
+
+        holidays = {}
+        try:
+            for item in data['holidays']:
+                holidays[datetime.strptime(item['date'], "%Y-%m-%d").date()] = str(item['name'])[:100]
+        except (KeyError, TypeError, ValueError):
+            return {'message': 'Each holiday needs a YYYY-MM-DD date and a name.'}, 400
+
+        if data.get('replace', True) and holidays:
+            years = {day.year for day in holidays}
+            db.session.execute(
+                delete(Holiday).where(
+                    Holiday.country == country,
+                    or_(*(Holiday.holiday_date.between(datetime(year, 1, 1).date(), datetime(year, 12, 31).date()) for year in years))
+                )
+            )
+        if holidays:
+            stmt = upsert_insert(Holiday.__table__)
+            db.session.execute(
+                stmt.on_conflict_do_update(index_elements=['country', 'holiday_date'], set_={'name': stmt.excluded.name}),
+                [{'country': country, 'holiday_date': day, 'name': name} for day, name in holidays.items()]
+            )
+        db.session.commit()
+        working_calendars.invalidate()
+
+        return {'message': 'Holidays uploaded', 'country': country, 'count': len(holidays)}, 201
@@ -0,0 +1,59 @@
+from flask import current_app
+from sqlalchemy import select, func
+
+from db import db
+from extensions import summary_cache
+from EmployeeManagement.models import Employee
+from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
+from AttendanceManagement.rollups import UNASSIGNED_DEPARTMENT
+
+
+PENDING_SUMMARY_KEY = 'pending'
+
+
+# Pending requests grouped by department and leave type, one GROUP BY query.
+# Rows are [department, leave_type, count, earliest start date] so they cache as JSON.
+def compute_pending_groups():
+    department = func.coalesce(Employee.emp_department, UNASSIGNED_DEPARTMENT)
+    rows = db.session.execute(
+        select(department, LeaveRequest.leave_type, func.count(LeaveRequest.id), func.min(LeaveRequest.start_date))
+        .join(Employee, Employee.id == LeaveRequest.employee_id)
+        .where(LeaveRequest.status == LeaveStatusEnum.PENDING)
+        .group_by(department, LeaveRequest.leave_type)
+    ).all()
+    return [[name, leave_type.value, count, str(earliest)] for name, leave_type, count, earliest in rows]
+
+
+# Cached pending groups, recomputed on a miss or after PENDING_SUMMARY_TTL_SECONDS
+def get_pending_groups():
+    groups = summary_cache.get(PENDING_SUMMARY_KEY)
+    if groups is None:
+        groups = compute_pending_groups()
+        summary_cache.set(PENDING_SUMMARY_KEY, groups, ttl=current_app.config['PENDING_SUMMARY_TTL_SECONDS'])
+    return groups
+
+
+# Call after committing anything that adds, moves or decides a pending request
+def invalidate_pending_summary():
+    summary_cache.delete(PENDING_SUMMARY_KEY)
+
+
+# Helper function to fold the groups into the dashboard response
+def summarize_pending(groups, department=None):
+    by_department = {}
+    by_leave_type = {}
+    for name, leave_type, count, earliest in groups:
+        if department is not None and name != department:
+            continue
+        entry = by_department.setdefault(name, {'department': name, 'count': 0, 'earliest_start_date': earliest})
+        entry['count'] += count
+        entry['earliest_start_date'] = min(entry['earliest_start_date'], earliest)
+        by_leave_type[leave_type] = by_leave_type.get(leave_type, 0) + count
+
+    departments = sorted(by_department.values(), key=lambda entry: entry['department'])
+    return {
+        'total': sum(entry['count'] for entry in departments),
+        'earliest_start_date': min((entry['earliest_start_date'] for entry in departments), default=None),
+        'by_department': departments,
+        'by_leave_type': [{'leave_type': name, 'count': count} for name, count in sorted(by_leave_type.items())],
+    }
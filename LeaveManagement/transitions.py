@@ -0,0 +1,64 @@
+from datetime import date
+
+from sqlalchemy import select, update, exists, func
+
+from db import db
+from EmployeeManagement.models import Employee, WorkStatusEnum
+from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
+
+
+# Move employees between 'In office' and 'On leave' for the given day with a
+# few set-based statements instead of one query per employee:
+#   1. normalize legacy spellings ('on leave', 'in office', ...) to WorkStatusEnum values
+#   2. back to the office when the latest approved leave that has started ended before today,
+#      or when there is no such leave at all
+#   3. on leave when an approved leave covers today
+# Returns row counts, the caller commits.
+def apply_leave_transitions(today):
+    counts = {'normalized': 0}
+    for status in WorkStatusEnum:
+        counts['normalized'] += db.session.execute(
+            update(Employee)
+            .where(func.lower(Employee.emp_work_status) == status.value.lower(), Employee.emp_work_status != status.value)
+            .values(emp_work_status=status.value)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+
+    latest_started_leave_end = (
+        select(func.max(LeaveRequest.end_date))
+        .where(
+            LeaveRequest.employee_id == Employee.id,
+            LeaveRequest.status == LeaveStatusEnum.APPROVED,
+            LeaveRequest.start_date <= today
+        )
+        .scalar_subquery()
+    )
+    counts['returned'] = db.session.execute(
+        update(Employee)
+        .where(
+            Employee.emp_work_status == WorkStatusEnum.ON_LEAVE.value,
+            # No started approved leave gives NULL, which would never compare < today
+            func.coalesce(latest_started_leave_end, date.min) < today
+        )
+        .values(emp_work_status=WorkStatusEnum.IN_OFFICE.value)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    leave_covers_today = exists().where(
+        LeaveRequest.employee_id == Employee.id,
+        LeaveRequest.status == LeaveStatusEnum.APPROVED,
+        LeaveRequest.start_date <= today,
+        LeaveRequest.end_date >= today
+    )
+    counts['started'] = db.session.execute(
+        update(Employee)
+        .where(
+            Employee.emp_status == 'Active',
+            func.coalesce(Employee.emp_work_status, '') != WorkStatusEnum.ON_LEAVE.value,
+            leave_covers_today
+        )
+        .values(emp_work_status=WorkStatusEnum.ON_LEAVE.value)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+    return counts
@@ -0,0 +1,124 @@
+import threading
+import time
+from array import array
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from db import db
+from LeaveManagement.models import Holiday
+
+
+# Helper function to normalize Employee.country / uploaded country names into calendar keys
+def country_key(country):
+    return (country or '').strip().lower()
+
+
+# Working days of one country between first_day and last_day as a prefix-sum array:
+# prefix[i] is the number of working days in [first_day, first_day + i), so any
+# range inside the window is counted with two lookups. Outside the window there
+# are no holidays and whole weeks are counted arithmetically.
+class WorkingCalendar:
+    def __init__(self, working_weekdays, holidays, first_day, last_day):
+        self.working_weekdays = frozenset(working_weekdays)
+        self.holidays = frozenset(holidays)
+        self.first_day = first_day
+        self.last_day = last_day
+
+        prefix = array('l', [0])
+        count = 0
+        for offset in range((last_day - first_day).days + 1):
+            if self.is_working_day(first_day + timedelta(days=offset)):
+                count += 1
+            prefix.append(count)
+        self._prefix = prefix
+
+    def is_working_day(self, day):
+        return day.weekday() in self.working_weekdays and day not in self.holidays
+
+    # Helper function to count working weekdays in [start, end) ignoring holidays
+    def _weekdays_between(self, start, end):
+        weeks, rest = divmod((end - start).days, 7)
+        first_weekday = start.weekday()
+        return weeks * len(self.working_weekdays) + sum(
+            (first_weekday + offset) % 7 in self.working_weekdays for offset in range(rest)
+        )
+
+    # Working days in [first_day, day); negative for days before the window
+    def _count_before(self, day):
+        if day < self.first_day:
+            return -self._weekdays_between(day, self.first_day)
+        offset = (day - self.first_day).days
+        if offset < len(self._prefix):
+            return self._prefix[offset]
+        return self._prefix[-1] + self._weekdays_between(self.last_day + timedelta(days=1), day)
+
+    # Working days in [start_date, end_date], both inclusive
+    def working_days(self, start_date, end_date):
+        if end_date < start_date:
+            return 0
+        return self._count_before(end_date + timedelta(days=1)) - self._count_before(start_date)
+
+
+# Per-process set of calendars, built from the holidays table on first use and
+# rebuilt after CALENDAR_REFRESH_SECONDS or when this process changes holidays.
+# Countries without holidays or their own weekdays share the default calendar.
+class CalendarRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calendars = None
+        self._default = None
+        self._loaded_at = 0
+        self.default_weekdays = (0, 1, 2, 3, 4)
+        self.country_weekdays = {}
+        self.years_around = 5
+        self.refresh_seconds = 300
+
+    def init_app(self, app):
+        self.default_weekdays = tuple(app.config.get('WORKING_DAYS', self.default_weekdays))
+        self.country_weekdays = {country_key(k): tuple(v) for k, v in app.config.get('COUNTRY_WORKING_DAYS', {}).items()}
+        self.years_around = app.config.get('CALENDAR_YEARS_AROUND', self.years_around)
+        self.refresh_seconds = app.config.get('CALENDAR_REFRESH_SECONDS', self.refresh_seconds)
+        self.invalidate()
+
+    def invalidate(self):
+        with self._lock:
+            self._calendars = None
+
+    def _load(self):
+        holidays = defaultdict(list)
+        for country, day in db.session.execute(select(Holiday.country, Holiday.holiday_date)):
+            holidays[country].append(day)
+
+        today = date.today()
+        first_day = date(today.year - self.years_around, 1, 1)
+        last_day = date(today.year + self.years_around, 12, 31)
+        all_days = [day for days in holidays.values() for day in days]
+        if all_days:
+            first_day = min(first_day, min(all_days))
+            last_day = max(last_day, max(all_days))
+
+        calendars = {}
+        for country in set(holidays) | set(self.country_weekdays):
+            weekdays = self.country_weekdays.get(country, self.default_weekdays)
+            calendars[country] = WorkingCalendar(weekdays, holidays.get(country, ()), first_day, last_day)
+        self._default = WorkingCalendar(self.default_weekdays, (), first_day, last_day)
+        self._calendars = calendars
+        self._loaded_at = time.monotonic()
+
+    # Calendar for an Employee.country value
+    def get(self, country):
+        with self._lock:
+            if self._calendars is None or time.monotonic() - self._loaded_at > self.refresh_seconds:
+                self._load()
+            return self._calendars.get(country_key(country), self._default)
+
+    # The given Employee.country values (as stored, None included) whose calendar
+    # does not work on the given day. Matching stays in country_key, so callers
+    # filter on the raw column instead of normalizing it again in SQL.
+    def non_working_countries(self, countries, day):
+        return {country for country in countries if not self.get(country).is_working_day(day)}
+
+
+working_calendars = CalendarRegistry()
@@ -4,7 +4,7 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from config import DevelopmentConfig
 from db import db
-from extensions import bcrypt, is_token_revoked
+from extensions import bcrypt, status_cache, summary_cache, roster_cache, is_token_revoked
 import extensions as security_utils
 
 
@@ -12,6 +12,10 @@ from Authentication.routes import auth_ns
 from EmployeeManagement.routes import employee_ns
 from AttendanceManagement.routes import attendance_ns
 from LeaveManagement.routes import leave_ns
+from AttendanceManagement.rollups import rollups_cli
+from LeaveManagement.workdays import working_calendars
+from EmployeeManagement.search import employee_search
+from EmployeeManagement.onboarding import employees_cli
 
 
 def create_app():
@@ -23,9 +27,18 @@ def create_app():
     # Initialize extensions
     db.init_app(app)
     bcrypt.init_app(app) # Initialize the app with bcrypt
+    status_cache.init_app(app)
+    summary_cache.init_app(app)
+    roster_cache.init_app(app)
+    working_calendars.init_app(app)
+    employee_search.init_app(app)
     jwt = JWTManager(app) #Initialize app with JWT
     migrate = Migrate(app, db) # Initialize Flask-Migrate 
 
+    # Register CLI commands
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(employees_cli)
+
     # Register token revocation callback
     @jwt.token_in_blocklist_loader
     def check_if_token_revoked(jwt_header, jwt_payload):
@@ -0,0 +1,117 @@
+"""
+Attendance analytics benchmark: vectorized NumPy engine vs. the ORM-object loop.
+
+Seeds ROWS attendance records spread over DEPARTMENTS departments in a throwaway
+database, then computes per-department clock-in time and worked-hours statistics
+both ways and prints the timings.
+
+    python benchmarks/attendance_analytics.py --rows 200000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+
+def build_app(database_url):
+    import config
+    config.DevelopmentConfig.SQLALCHEMY_DATABASE_URI = database_url
+    from app import create_app
+    return create_app()
+
+
+def seed(rows, departments):
+    from db import db
+    from Authentication.models import Auth
+    from EmployeeManagement.models import Employee
+    from AttendanceManagement.models import Attendance
+
+    db.drop_all()
+    db.create_all()
+    employee_count = max(1, rows // 250)
+    db.session.execute(Auth.__table__.insert(), [
+        {"id": i, "email": f"bench{i}@example.com", "password_hash": "x"} for i in range(1, employee_count + 1)
+    ])
+    db.session.execute(Employee.__table__.insert(), [
+        {"id": i, "auth_id": i, "first_name": "Bench", "last_name": str(i), "phone_no": "0", "gender": "x",
+         "address": "x", "country": "US", "emp_department": f"Department {i % departments}", "emp_status": "Active"}
+        for i in range(1, employee_count + 1)
+    ])
+
+    start = date(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        employee_id = i % employee_count + 1
+        day = start + timedelta(days=i // employee_count)
+        clock_in = datetime.combine(day, datetime.min.time()) + timedelta(minutes=random.randint(7 * 60, 10 * 60))
+        hours = round(random.uniform(4, 11), 2)
+        batch.append({"employee_id": employee_id, "date": day, "clock_in_time": clock_in,
+                      "clock_out_time": clock_in + timedelta(hours=hours), "total_hours": hours, "status": "Present"})
+        if len(batch) == 10000:
+            db.session.execute(Attendance.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Attendance.__table__.insert(), batch)
+    db.session.commit()
+    return start, start + timedelta(days=rows // employee_count + 1)
+
+
+def orm_loop(date_from, date_to):
+    from AttendanceManagement.models import Attendance
+    from EmployeeManagement.models import Employee
+
+    minutes = defaultdict(list)
+    hours = defaultdict(list)
+    records = Attendance.query.join(Employee, Employee.id == Attendance.employee_id) \
+                              .filter(Attendance.date >= date_from, Attendance.date <= date_to).all()
+    for record in records:
+        department = record.employee.emp_department
+        if record.clock_in_time:
+            minutes[department].append(record.clock_in_time.hour * 60 + record.clock_in_time.minute)
+        if record.total_hours:
+            hours[department].append(float(record.total_hours))
+    return {
+        department: (statistics.mean(values), statistics.quantiles(values, n=100), statistics.quantiles(hours[department], n=100))
+        for department, values in minutes.items()
+    }
+
+
+def vectorized(date_from, date_to):
+    from AttendanceManagement.analytics import load_attendance_frame, clock_in_stats, hours_stats
+    frame = load_attendance_frame(date_from, date_to)
+    return clock_in_stats(frame), hours_stats(frame, overtime_threshold=8)
+
+
+def timed(label, fn, *args):
+    from db import db
+    db.session.expunge_all()
+    started = time.perf_counter()
+    fn(*args)
+    print(f"{label:>12}: {time.perf_counter() - started:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--departments", type=int, default=20)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    app = build_app(args.database_url or "sqlite:///" + tempfile.mktemp(suffix=".db"))
+    with app.app_context():
+        date_from, date_to = seed(args.rows, args.departments)
+        print(f"{args.rows} attendance rows, {args.departments} departments")
+        timed("ORM loop", orm_loop, date_from, date_to)
+        timed("vectorized", vectorized, date_from, date_to)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Bulk onboarding benchmark: /authentication/register one call at a time versus
+import_employees (one validation pass, parallel bcrypt, batched inserts).
+
+Each round registers EMPLOYEES new people both ways in a throwaway database and
+prints the wall time and per-employee cost. Hashing dominates, so the speedup
+tracks the number of cores given to --workers.
+
+    python benchmarks/bulk_onboarding.py --employees 500 --workers 8
+    python benchmarks/bulk_onboarding.py --rounds 3 --database-url postgresql://user:pw@localhost/hr_bench
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+
+def build_app(database_url):
+    import config
+    config.DevelopmentConfig.SQLALCHEMY_DATABASE_URI = database_url
+    from app import create_app
+    return create_app()
+
+
+def rows(prefix, count):
+    return [
+        {"email": f"{prefix}{i}@example.com", "password": f"Passw0rd-{i}", "first_name": "Bench",
+         "last_name": str(i), "phone_no": "0", "gender": "x", "address": "x", "country": "US"}
+        for i in range(count)
+    ]
+
+
+def per_call(app, payloads):
+    client = app.test_client()
+    started = time.perf_counter()
+    statuses = [client.post("/authentication/register", json=payload).status_code for payload in payloads]
+    elapsed = time.perf_counter() - started
+    assert all(status == 201 for status in statuses), set(statuses)
+    return elapsed
+
+
+def bulk(app, payloads, workers):
+    from EmployeeManagement.onboarding import import_employees, summarize_report
+
+    with app.app_context():
+        started = time.perf_counter()
+        report = import_employees(payloads, workers=workers)
+        elapsed = time.perf_counter() - started
+    assert summarize_report(report) == {"created": len(payloads)}, summarize_report(report)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Hashing threads for the bulk import")
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or "sqlite:///" + tempfile.mktemp(suffix=".db")
+    app = build_app(database_url)
+    with app.app_context():
+        from db import db
+        db.drop_all()
+        db.create_all()
+
+    single, batched = [], []
+    for round_no in range(args.rounds):
+        single.append(per_call(app, rows(f"single{round_no}-", args.employees)))
+        batched.append(bulk(app, rows(f"bulk{round_no}-", args.employees), args.workers))
+
+    for label, timings in (("register per call", single), (f"import_employees ({args.workers} workers)", batched)):
+        best = min(timings)
+        print(f"{label}: {args.employees} employees, best {best:.2f}s "
+              f"median {statistics.median(timings):.2f}s ({best / args.employees * 1000:.1f}ms/employee)")
+    print(f"speedup: {min(single) / min(batched):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Shift-start burst benchmark for /attendance/clock-in and /attendance/clock-out.
+
+Creates EMPLOYEES employees in a throwaway database, then fires one clock-in per
+employee (plus a share of duplicate "double taps") from a thread pool and prints
+latency percentiles and status code counts. Repeats the burst for clock-out.
+
+    python benchmarks/clock_burst.py --employees 2000 --workers 32
+    python benchmarks/clock_burst.py --database-url postgresql://user:pw@localhost/hr_bench
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+
+def build_app(database_url):
+    import config
+    config.DevelopmentConfig.SQLALCHEMY_DATABASE_URI = database_url
+    from app import create_app
+    return create_app()
+
+
+def seed(app, count):
+    from flask_jwt_extended import create_access_token
+    from db import db
+    from Authentication.models import Auth
+    from EmployeeManagement.models import Employee
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        auths = [Auth(email=f"bench{i}@example.com", password_hash="x") for i in range(count)]
+        db.session.add_all(auths)
+        db.session.flush()
+        employees = [
+            Employee(auth_id=auth.id, first_name="Bench", last_name=str(i), phone_no="0", gender="x",
+                     address="x", country="US", emp_department="Engineering", emp_rank="staff", emp_status="Active")
+            for i, auth in enumerate(auths)
+        ]
+        db.session.add_all(employees)
+        db.session.commit()
+        return [
+            {"Authorization": "Bearer " + create_access_token(
+                identity=f"bench{i}@example.com",
+                additional_claims={"emp_id": emp.id, "emp_rank": "staff", "emp_department": "Engineering"})}
+            for i, emp in enumerate(employees)
+        ]
+
+
+def burst(app, path, headers, workers):
+    def call(header):
+        client = app.test_client()
+        started = time.perf_counter()
+        status = client.post(path, headers=header).status_code
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(call, headers))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, _ in results)
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"{path}: {len(results)} requests in {elapsed:.2f}s ({len(results) / elapsed:.0f} req/s)")
+    print(f"  p50={quantiles[49]:.1f}ms p95={quantiles[94]:.1f}ms p99={quantiles[98]:.1f}ms max={latencies[-1]:.1f}ms")
+    print(f"  status codes: {dict(Counter(status for _, status in results))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--double-taps", type=float, default=0.1, help="Share of employees that tap twice")
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or "sqlite:///" + tempfile.mktemp(suffix=".db")
+    app = build_app(database_url)
+    headers = seed(app, args.employees)
+
+    taps = headers + random.sample(headers, int(len(headers) * args.double_taps))
+    random.shuffle(taps)
+
+    burst(app, "/attendance/clock-in", taps, args.workers)
+    burst(app, "/attendance/clock-out", taps, args.workers)
+
+
+if __name__ == "__main__":
+    main()
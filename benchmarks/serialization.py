@@ -0,0 +1,114 @@
+"""
+Serialization micro-benchmark: flask_restx marshal over ORM objects vs. the
+compiled RowSerializer over Core rows with orjson.
+
+Seeds the largest of ROWS attendance records in a throwaway database, then for
+each size times the load, the row-to-dict step and the JSON encoding both ways,
+best of --repeat runs. The outputs are checked to be identical first.
+
+    python benchmarks/serialization.py --rows 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark-secret-key-not-for-production")
+
+
+def build_app(database_url):
+    import config
+    config.DevelopmentConfig.SQLALCHEMY_DATABASE_URI = database_url
+    from app import create_app
+    return create_app()
+
+
+def seed(rows):
+    from db import db
+    from Authentication.models import Auth
+    from EmployeeManagement.models import Employee
+    from AttendanceManagement.models import Attendance
+
+    db.drop_all()
+    db.create_all()
+    employee_count = max(1, rows // 250)
+    db.session.execute(Auth.__table__.insert(), [
+        {"id": i, "email": f"bench{i}@example.com", "password_hash": "x"} for i in range(1, employee_count + 1)
+    ])
+    db.session.execute(Employee.__table__.insert(), [
+        {"id": i, "auth_id": i, "first_name": "Bench", "last_name": str(i), "phone_no": "0", "gender": "x",
+         "address": "x", "country": "US", "emp_department": "Engineering", "emp_status": "Active"}
+        for i in range(1, employee_count + 1)
+    ])
+
+    start = date(2024, 1, 1)
+    batch = []
+    for i in range(rows):
+        day = start + timedelta(days=i // employee_count)
+        clock_in = datetime.combine(day, datetime.min.time()) + timedelta(hours=9, seconds=i % 3600)
+        batch.append({"employee_id": i % employee_count + 1, "date": day, "clock_in_time": clock_in,
+                      "clock_out_time": clock_in + timedelta(hours=8), "total_hours": 8, "status": "Present"})
+        if len(batch) == 10000:
+            db.session.execute(Attendance.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Attendance.__table__.insert(), batch)
+    db.session.commit()
+
+
+def best_of(repeat, fn):
+    from db import db
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    app = build_app(args.database_url or "sqlite:///" + tempfile.mktemp(suffix=".db"))
+    with app.app_context():
+        import orjson
+        from flask_restx import marshal
+        from AttendanceManagement.models import Attendance
+        from AttendanceManagement.routes import attendance_model, attendance_serializer
+
+        seed(max(args.rows))
+        for rows in sorted(args.rows):
+            orm_query = Attendance.query.order_by(Attendance.id).limit(rows)
+            core_query = Attendance.query.with_entities(*attendance_serializer.columns).order_by(Attendance.id).limit(rows)
+
+            records = orm_query.all()
+            core_rows = core_query.all()
+            assert marshal(records, attendance_model) == attendance_serializer.serialize_all(core_rows)
+
+            load_orm, records = best_of(args.repeat, orm_query.all)
+            load_core, core_rows = best_of(args.repeat, core_query.all)
+            build_marshal, marshalled = best_of(args.repeat, lambda: marshal(records, attendance_model))
+            build_compiled, compiled = best_of(args.repeat, lambda: attendance_serializer.serialize_all(core_rows))
+            encode_json, _ = best_of(args.repeat, lambda: json.dumps(marshalled))
+            encode_orjson, _ = best_of(args.repeat, lambda: orjson.dumps(compiled))
+
+            before = load_orm + build_marshal + encode_json
+            after = load_core + build_compiled + encode_orjson
+            print(f"{rows} rows")
+            print(f"  {'':>10} {'load':>8} {'to dict':>8} {'encode':>8} {'total':>8}")
+            print(f"  {'marshal':>10} {load_orm:8.3f} {build_marshal:8.3f} {encode_json:8.3f} {before:8.3f}s")
+            print(f"  {'compiled':>10} {load_core:8.3f} {build_compiled:8.3f} {encode_orjson:8.3f} {after:8.3f}s")
+            print(f"  to dict {build_marshal / build_compiled:.1f}x faster, end to end {before / after:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+
+logger = logging.getLogger(__name__)
+
+
+# In-process LRU cache with optional per-key TTL.
+# Stand-in for Redis in development and single-process deployments.
+class LocalCache:
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    # Set only if the key is absent (or expired), returns whether it was set
+    def add(self, key, value, ttl=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and (item[1] is None or item[1] > time.monotonic()):
+                return False
+            self._data[key] = (value, time.monotonic() + ttl if ttl else None)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+            return True
+
+    def delete(self, *keys):
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def incr(self, key):
+        with self._lock:
+            value, expires_at = self._data.get(key, (0, None))
+            self._data[key] = (value + 1, expires_at)
+            self._data.move_to_end(key)
+            return value + 1
+
+
+# Shared cache backed by Redis. Values are stored as JSON; connection errors are
+# logged and treated as cache misses so the database stays the source of truth.
+class RedisCache:
+    def __init__(self, url, prefix):
+        import redis
+        self._redis = redis
+        self._client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, key):
+        return f'{self.prefix}:{key}'
+
+    def get(self, key):
+        try:
+            value = self._client.get(self._key(key))
+        except self._redis.RedisError:
+            logger.warning('Cache read failed for %s', key, exc_info=True)
+            return None
+        return json.loads(value) if value is not None else None
+
+    def set(self, key, value, ttl=None):
+        try:
+            self._client.set(self._key(key), json.dumps(value), ex=int(ttl) if ttl else None)
+        except self._redis.RedisError:
+            logger.warning('Cache write failed for %s', key, exc_info=True)
+
+    def add(self, key, value, ttl=None):
+        try:
+            return bool(self._client.set(self._key(key), json.dumps(value), ex=int(ttl) if ttl else None, nx=True))
+        except self._redis.RedisError:
+            logger.warning('Cache add failed for %s', key, exc_info=True)
+            return False
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        try:
+            self._client.delete(*(self._key(key) for key in keys))
+        except self._redis.RedisError:
+            logger.warning('Cache delete failed for %s', keys, exc_info=True)
+
+    def incr(self, key):
+        try:
+            return self._client.incr(self._key(key))
+        except self._redis.RedisError:
+            logger.warning('Cache incr failed for %s', key, exc_info=True)
+            return None
+
+
+# Flask extension wrapper: picks Redis when CACHE_REDIS_URL is configured,
+# otherwise a bounded LocalCache sized by the given config key.
+class Cache:
+    def __init__(self, namespace, size_config='CACHE_MAX_ENTRIES'):
+        self.namespace = namespace
+        self.size_config = size_config
+        self.backend = LocalCache()
+
+    def init_app(self, app):
+        redis_url = app.config.get('CACHE_REDIS_URL')
+        if redis_url:
+            self.backend = RedisCache(redis_url, prefix=f'hrstreamline:{self.namespace}')
+        else:
+            self.backend = LocalCache(max_entries=app.config.get(self.size_config, 10000))
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value, ttl=None):
+        self.backend.set(key, value, ttl)
+
+    def add(self, key, value, ttl=None):
+        return self.backend.add(key, value, ttl)
+
+    def delete(self, *keys):
+        self.backend.delete(*keys)
+
+    def incr(self, key):
+        return self.backend.incr(key)
@@ -1,11 +1,12 @@
 from celery import Celery
 from celery.schedules import crontab  # <-- Import here
-from config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND
+from config import CELERY_BROKER_URL, CELERY_RESULT_BACKEND, OUTBOX_POLL_SECONDS
 
 celery = Celery(
     "leave_app",
     broker=CELERY_BROKER_URL,
-    backend=CELERY_RESULT_BACKEND
+    backend=CELERY_RESULT_BACKEND,
+    include=["task.accrual", "task.attendance", "task.outbox"]
 )
 
 celery.conf.beat_schedule = {
@@ -16,5 +17,17 @@ celery.conf.beat_schedule = {
     "check-leave-end-status-daily": {
         "task": "tasks.leave.end_leave_status_check",
         "schedule": crontab(hour=0, minute=30),  # Runs daily at 00:30 AM
+    },
+    "classify-attendance-daily": {
+        "task": "tasks.attendance.classify_attendance",
+        "schedule": crontab(hour=0, minute=15),  # Runs daily at 00:15 AM for the previous day
+    },
+    "reconcile-leave-balances-weekly": {
+        "task": "tasks.leave.reconcile_leave_balances",
+        "schedule": crontab(day_of_week=0, hour=1, minute=0),  # Runs Sundays at 01:00 AM
+    },
+    "drain-leave-outbox": {
+        "task": "tasks.leave.drain_outbox",
+        "schedule": OUTBOX_POLL_SECONDS,  # Delivers leave decision side effects every 30 seconds by default
     }
 }
@@ -1,10 +1,74 @@
 import os
 
 
+# Celery broker/result backend, read by celery_worker
+CELERY_BROKER_URL = os.environ.get("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.environ.get("CELERY_RESULT_BACKEND", "redis://localhost:6379/0")
+
+# How often beat asks the worker to drain the leave outbox
+OUTBOX_POLL_SECONDS = float(os.environ.get("OUTBOX_POLL_SECONDS", 30))
+
 class Config(object):
     TESTING = False
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Cursor pagination defaults for listing endpoints
+    PAGE_SIZE_DEFAULT = 100
+    PAGE_SIZE_MAX = 1000
+
+    # Largest batch accepted by /attendance/events/bulk
+    ATTENDANCE_BULK_MAX_EVENTS = 10000
+
+    # Shift policy used by attendance analytics and classification
+    SHIFT_START = "09:00"
+    LATE_GRACE_MINUTES = 15
+    HALF_DAY_HOURS = 4
+    OVERTIME_THRESHOLD_HOURS = 8
+    WORKING_DAYS = (0, 1, 2, 3, 4)  # Monday to Friday
+
+    # Working-day calendars: weekdays per country where they differ from WORKING_DAYS,
+    # keyed on lower-cased Employee.country, e.g. {"saudi arabia": (6, 0, 1, 2, 3)}
+    COUNTRY_WORKING_DAYS = {}
+    CALENDAR_YEARS_AROUND = 5  # prefix sums cover this many years either side of today
+    CALENDAR_REFRESH_SECONDS = 300  # other processes pick up uploaded holidays within this
+
+    # Bulk onboarding: rows per /employees/import call, password hashing threads (None = CPU count)
+    IMPORT_MAX_ROWS = 10000
+    IMPORT_HASH_WORKERS = None
+
+    # Largest list of per-employee changes accepted by /employees/bulk-update
+    EMPLOYEE_BULK_MAX_UPDATES = 5000
+
+    # Largest batch accepted by /leave/bulk-decision
+    LEAVE_BULK_MAX_DECISIONS = 1000
+
+    # Leave outbox delivery: events per batch, attempts before giving up, backoff bounds
+    OUTBOX_BATCH_SIZE = 100
+    OUTBOX_MAX_ATTEMPTS = 8
+    OUTBOX_BACKOFF_SECONDS = 30
+    OUTBOX_BACKOFF_MAX_SECONDS = 3600
+
+    # Longest window served by /leave/coverage, default window when no end date is given
+    COVERAGE_MAX_DAYS = 366
+    COVERAGE_DEFAULT_DAYS = 31
+
+    # Employees updated per transaction by the monthly accrual
+    ACCRUAL_CHUNK_SIZE = 5000
+
+    # Shared cache; without a Redis URL each process keeps a bounded in-memory LRU.
+    # The clock status, pending summary and department roster caches are written
+    # through/invalidated by whichever process changes the data, so set this on every
+    # web, worker and beat process once there is more than one of them.
+    CACHE_REDIS_URL = os.environ.get("CACHE_REDIS_URL")
+    CACHE_MAX_ENTRIES = 10000
+    ATTENDANCE_STATUS_CACHE_SIZE = 100000
+    PENDING_SUMMARY_TTL_SECONDS = 60  # upper bound on staleness if an invalidation is missed
+    ROSTER_CACHE_TTL_SECONDS = 3600  # cached department rosters, also dropped on every version bump
+
+    # In-process employee search index: full rebuild interval (picks up other processes' writes)
+    SEARCH_INDEX_REFRESH_SECONDS = 300
+    SEARCH_RESULTS_MAX = 50
+
 class ProductionConfig(Config):
     SQLALCHEMY_DATABASE_URI = 'production_uri'
     JWT_SECRET_KEY = os.environ.get("JWT_SECRET_KEY")
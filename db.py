@@ -1,8 +1,50 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import func, cast, Date, Numeric, extract
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import DeclarativeBase
 
 
 class Base(DeclarativeBase):
   pass
 
-db = SQLAlchemy(model_class=Base)
\ No newline at end of file
+db = SQLAlchemy(model_class=Base)
+
+
+# Helper functions for the few statements that differ between SQLite (development)
+# and PostgreSQL (production)
+def dialect_name():
+    return db.session.get_bind().dialect.name
+
+
+# INSERT construct supporting on_conflict_do_nothing/on_conflict_do_update
+def upsert_insert(table):
+    if dialect_name() == 'postgresql':
+        return postgresql.insert(table)
+    return sqlite.insert(table)
+
+
+# First day of the month of a date column
+def month_start(column):
+    if dialect_name() == 'postgresql':
+        return cast(func.date_trunc('month', column), Date)
+    return func.date(column, 'start of month')
+
+
+# Hours between two datetime columns, rounded to 2 decimals
+def hours_between(start, end):
+    if dialect_name() == 'postgresql':
+        return func.round(cast(extract('epoch', end - start) / 3600, Numeric), 2)
+    return func.round((func.julianday(end) - func.julianday(start)) * 24, 2)
+
+
+# Smallest/largest of two values, ignoring NULLs like PostgreSQL's LEAST/GREATEST
+def least(a, b):
+    if dialect_name() == 'postgresql':
+        return func.least(a, b)
+    return func.min(func.coalesce(a, b), func.coalesce(b, a))
+
+
+def greatest(a, b):
+    if dialect_name() == 'postgresql':
+        return func.greatest(a, b)
+    return func.max(func.coalesce(a, b), func.coalesce(b, a))
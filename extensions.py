@@ -1,8 +1,18 @@
 from flask_bcrypt import Bcrypt
+from cache import Cache
 
 
 bcrypt = Bcrypt()
 
+# Today's clock status per employee, see AttendanceManagement.status_cache
+status_cache = Cache('attendance-status', size_config='ATTENDANCE_STATUS_CACHE_SIZE')
+
+# Aggregates behind manager dashboards, see LeaveManagement.summary
+summary_cache = Cache('leave-summary')
+
+# Versioned department rosters, see EmployeeManagement.roster
+roster_cache = Cache('department-roster')
+
 blacklist = set()
 def is_token_revoked(jwt_header, jwt_payload):
     return jwt_payload["jti"] in blacklist
\ No newline at end of file
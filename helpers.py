@@ -1,4 +1,11 @@
+import base64
+import hashlib
+import json
+from datetime import date, datetime, timedelta
+from flask import request, current_app
 from flask_jwt_extended import get_jwt
+from werkzeug.http import quote_etag
+from sqlalchemy import Date, and_, or_
 from db import db
 from EmployeeManagement.models import Employee
 from AttendanceManagement.models import Attendance
@@ -15,29 +22,150 @@ def get_current_employee():
     }
 
 
+# Helper function for a strong ETag: the request URL (path, filters and cursor), the
+# caller and a cheap fingerprint of the rows behind the response, e.g. a version
+# column or count/max(updated_at)
+def make_etag(*fingerprint):
+    payload = repr((request.full_path, get_jwt().get('emp_id'), fingerprint))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+# Helper function for the headers sent with an ETag; clients may keep the body but must revalidate
+def etag_headers(etag):
+    return {'ETag': quote_etag(etag), 'Cache-Control': 'private, no-cache'}
+
+
+# Helper function for conditional GETs: a bodiless 304 when If-None-Match already has etag, else None
+def not_modified(etag):
+    if request.if_none_match.contains_weak(etag):
+        return current_app.response_class(status=304, headers=etag_headers(etag))
+    return None
+
+
 # Helper function to get employee by ID
 def get_employee_by_id(emp_id):
     return Employee.query.filter_by(id=emp_id).first()
 
 
-# Helper function to filter attendance records
-def get_filtered_attendance(queryset, year, month, day):
-    if year:
-        queryset = queryset.filter(db.extract('year', Attendance.date) == int(year))
+# Helper function to parse an optional YYYY-MM-DD query value
+def parse_date_arg(value):
+    if not value:
+        return None
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+# Helper function to read the attendance date filters from the query string
+def get_attendance_filter_args():
+    filters = {
+        'year': request.args.get('year', type=int),
+        'month': request.args.get('month', type=int),
+        'day': request.args.get('day', type=int),
+        'date_from': parse_date_arg(request.args.get('from')),
+        'date_to': parse_date_arg(request.args.get('to')),
+    }
+    if filters['year']:
+        # Raises ValueError for impossible dates such as month=13
+        get_date_range(filters['year'], filters['month'], filters['day'] if filters['month'] else None)
+    return filters
+
+
+# Helper function to turn year/month/day into a half-open [start, end) date range
+def get_date_range(year, month=None, day=None):
+    if day and month:
+        start = date(year, month, day)
+        return start, start + timedelta(days=1)
     if month:
+        start = date(year, month, 1)
+        end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        return start, end
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+# Helper function to apply the date filters to an attendance query.
+# Filters are expressed as plain comparisons on Attendance.date so the
+# ix_attendance_date / unique_employee_date indexes can be used.
+def filter_attendance(queryset, year=None, month=None, day=None, date_from=None, date_to=None):
+    if year:
+        start, end = get_date_range(int(year), int(month) if month else None, int(day) if day and month else None)
+        queryset = queryset.filter(Attendance.date >= start, Attendance.date < end)
+    # Parts without their enclosing year/month have no single range, match them directly
+    if month and not year:
         queryset = queryset.filter(db.extract('month', Attendance.date) == int(month))
-    if day:
+    if day and not (year and month):
         queryset = queryset.filter(db.extract('day', Attendance.date) == int(day))
+    if date_from:
+        queryset = queryset.filter(Attendance.date >= date_from)
+    if date_to:
+        queryset = queryset.filter(Attendance.date < date_to + timedelta(days=1))
+    return queryset
+
+
+# Helper function to filter attendance records
+def get_filtered_attendance(queryset, year=None, month=None, day=None, date_from=None, date_to=None):
+    queryset = filter_attendance(queryset, year, month, day, date_from, date_to)
     results = queryset.order_by(Attendance.date.desc()).all()
     return results
 
-'''
-def get_filtered_attendance(queryset, year, month, day):
-    if year:
-        queryset = queryset.filter(db.extract('year', Attendance.date) == int(year))
-    if month:
-        queryset = queryset.filter(db.extract('month', Attendance.date) == int(month))
-    if day:
-        queryset = queryset.filter(db.extract('day', Attendance.date) == int(day))
-    return queryset.order_by(Attendance.date.desc()).all()
-'''
+
+# Helper functions to build/read opaque pagination cursors
+def encode_cursor(*values):
+    values = [value.isoformat() if isinstance(value, date) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+# Helper function to read limit/cursor from the query string
+def get_page_args():
+    default = current_app.config.get('PAGE_SIZE_DEFAULT', 100)
+    maximum = current_app.config.get('PAGE_SIZE_MAX', 1000)
+    limit = request.args.get('limit', default=default, type=int)
+    cursor = request.args.get('cursor')
+    return max(1, min(limit, maximum)), decode_cursor(cursor) if cursor else None
+
+
+# Helper function for keyset pagination on (sort_column, id_column), newest first
+# unless descending=False. The cursor holds the last row's key so every page is a
+# single index range scan.
+def paginate_keyset(queryset, sort_column, id_column, cursor, limit, descending=True):
+    if cursor:
+        if len(cursor) != 2:
+            raise ValueError('Invalid cursor')
+        sort_value, last_id = cursor
+        try:
+            if isinstance(sort_column.type, Date):
+                sort_value = date.fromisoformat(sort_value)
+            last_id = int(last_id)
+        except (ValueError, TypeError):
+            raise ValueError('Invalid cursor')
+        if descending:
+            queryset = queryset.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < last_id)
+            ))
+        else:
+            queryset = queryset.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > last_id)
+            ))
+
+    if descending:
+        queryset = queryset.order_by(sort_column.desc(), id_column.desc())
+    else:
+        queryset = queryset.order_by(sort_column.asc(), id_column.asc())
+    rows = queryset.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_column.key), getattr(last, id_column.key))
+    return rows, next_cursor
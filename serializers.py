@@ -0,0 +1,92 @@
+import orjson
+from flask import current_app
+from flask_restx import fields
+from flask_restx.inputs import boolean
+
+
+# Helper function for the generated conversion of one field. Returns the expression
+# applied to `value`, or None when the column already yields what marshal would output.
+def _conversion(field, column):
+    try:
+        python_type = column.type.python_type
+    except (AttributeError, NotImplementedError):
+        python_type = None
+
+    if isinstance(field, fields.Integer):
+        return None if python_type is int else 'int(value)'
+    if isinstance(field, fields.Float):
+        return None if python_type is float else 'float(value)'
+    if isinstance(field, fields.Boolean):
+        return 'boolean(value)'
+    if isinstance(field, fields.String):
+        # str() like fields.String: dates become YYYY-MM-DD, enums their str()
+        return None if python_type is str else 'str(value)'
+    if type(field) is fields.Raw:
+        return None
+    raise TypeError(f'{type(field).__name__} fields are not supported by RowSerializer')
+
+
+# Compiled stand-in for marshal(rows, model) on Core rows. The model is turned into
+# one generated function, e.g. for attendance_model
+#     def serialize(row):
+#         return {'id': row[0], 'date': None if row[2] is None else str(row[2]), ...}
+# so a row costs one dict build instead of a get_value/format call per field.
+# columns maps field names to the column expressions that yield what marshal would
+# read from the ORM object; other fields default to getattr(entity, attribute or name).
+# Rows may carry extra trailing columns (e.g. a sort key for the cursor).
+class RowSerializer:
+    def __init__(self, model, entity, **columns):
+        self.model = model
+        self.entity = entity
+        self.overrides = columns
+        self.names = list(model.keys())
+        # Fields may be given as classes, marshal instantiates them the same way
+        self.fields = [field() if isinstance(field, type) else field for field in model.values()]
+        self.columns = [
+            columns[name] if name in columns else getattr(entity, field.attribute or name)
+            for name, field in zip(self.names, self.fields)
+        ]
+        self._projections = {}
+        self.serialize = self._compile()
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def _compile(self):
+        items = []
+        for index, (name, field, column) in enumerate(zip(self.names, self.fields, self.columns)):
+            if callable(field.default):
+                raise TypeError(f'{name}: callable defaults are not supported by RowSerializer')
+            # What Raw.output returns for a missing value
+            missing = field.format(field.default) if field.default else field.default
+            conversion = _conversion(field, column)
+            value = f'row[{index}]'
+            if conversion is not None:
+                value = f'(None if {value} is None else {conversion.replace("value", value)})'
+            if missing is not None:
+                value = f'(_missing[{index}] if row[{index}] is None else {value})'
+            items.append((name, value, missing))
+
+        source = 'def serialize(row):\n    return {%s}\n' % ', '.join(f'{name!r}: {value}' for name, value, _ in items)
+        namespace = {'boolean': boolean, '_missing': [missing for _, _, missing in items]}
+        exec(compile(source, f'<serializer {self.model.name}>', 'exec'), namespace)
+        return namespace['serialize']
+
+    # Serializer for a subset of the fields, e.g. from ?fields=; cached per subset
+    def project(self, names):
+        key = tuple(names)
+        if key not in self._projections:
+            subset = type(self.model)(self.model.name, {name: self.model[name] for name in names})
+            self._projections[key] = RowSerializer(
+                subset, self.entity, **{name: column for name, column in self.overrides.items() if name in names}
+            )
+        return self._projections[key]
+
+    def serialize_all(self, rows):
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+
+# Helper function to send an already serialized body through orjson, bypassing flask_restx's json.dumps
+def json_response(body, status=200, headers=None):
+    return current_app.response_class(orjson.dumps(body), status=status, headers=headers, mimetype='application/json')
@@ -1,51 +1,131 @@
+import time
 from celery_worker import celery
 from db import db
 from EmployeeManagement.models import Employee
-from datetime import date
+from datetime import date, datetime
 from celery.schedules import crontab
+from sqlalchemy import select, update, func, or_, bindparam
 
-from LeaveManagement.models import LeaveRequest, LeaveStatusEnum
-from EmployeeManagement.models import Employee
+from LeaveManagement.models import AccrualRun, LeaveLedgerEntry, LedgerEntryTypeEnum
+from LeaveManagement.ledger import StaleBalanceError, reconcile_balances, OPENING_BALANCE_NOTE
+from LeaveManagement.transitions import apply_leave_transitions
 
 # Import the factory and create app
 from app import create_app
 
 app = create_app()  # Create the app instance
 
+# Expected balance is two days per month worked, computed in SQL
+def expected_balance(today):
+    months_worked = (today.year - db.extract('year', Employee.emp_start_date)) * 12 \
+                    + (today.month - db.extract('month', Employee.emp_start_date))
+    return months_worked * 2
+
+
+# Top up one primary-key chunk to the expected balance, writing an accrual ledger
+# entry per employee and the cached balances with one executemany UPDATE.
+def accrue_chunk(run, last_id, upper_id, expected, rows_touched):
+    # Record progress first: the write takes the database write lock (SQLite) before the
+    # balances are read, and FOR UPDATE holds the rows on PostgreSQL.
+    db.session.execute(update(AccrualRun).where(AccrualRun.id == run.id).values(rows_touched=rows_touched))
+
+    rows = db.session.execute(
+        select(Employee.id, Employee.emp_leave_balance, Employee.emp_leave_balance_version, expected)
+        .where(
+            Employee.id > last_id,
+            Employee.id <= upper_id,
+            Employee.emp_status == 'Active',
+            Employee.emp_start_date.isnot(None),
+            or_(Employee.emp_leave_balance.is_(None), Employee.emp_leave_balance < expected)
+        )
+        .with_for_update()
+    ).all()
+    if not rows:
+        return 0
+
+    now = datetime.now()
+    note = f"Monthly accrual {run.period:%Y-%m}"
+    entries = []
+    balances = []
+    for employee_id, balance, version, target in rows:
+        balance = balance or 0
+        if version == 0 and balance:
+            entries.append({'employee_id': employee_id, 'entry_type': LedgerEntryTypeEnum.ADJUSTMENT,
+                            'amount': balance, 'balance_after': balance, 'note': OPENING_BALANCE_NOTE, 'created_at': now})
+        entries.append({'employee_id': employee_id, 'entry_type': LedgerEntryTypeEnum.ACCRUAL,
+                        'amount': target - balance, 'balance_after': target, 'note': note, 'created_at': now})
+        balances.append({'b_id': employee_id, 'b_version': version, 'balance': target})
+
+    employee = Employee.__table__
+    result = db.session.execute(
+        update(employee)
+        .where(employee.c.id == bindparam('b_id'), employee.c.emp_leave_balance_version == bindparam('b_version'))
+        .values(emp_leave_balance=bindparam('balance'), emp_leave_balance_version=employee.c.emp_leave_balance_version + 1),
+        balances
+    )
+    # psycopg2 batches executemany and cannot report the total; the row locks cover PostgreSQL
+    if db.session.get_bind().dialect.supports_sane_multi_rowcount and result.rowcount != len(balances):
+        raise StaleBalanceError(f"Balances changed during accrual of ids {last_id + 1}-{upper_id}")
+    db.session.execute(LeaveLedgerEntry.__table__.insert(), entries)
+    return len(rows)
+
+
 @celery.task(name="tasks.accrual.monthly_accrual")
 def monthly_accrual():
     with app.app_context():
         today = date.today()
-        employees = Employee.query.filter(Employee.emp_status == 'Active').all()
+        period = today.replace(day=1)
+        started = time.perf_counter()
 
-        for emp in employees:
-            if emp.emp_start_date:
-                months_worked = (today.year - emp.emp_start_date.year) * 12 + (today.month - emp.emp_start_date.month)
-                expected_balance = months_worked * 2
+        run = AccrualRun.query.filter_by(period=period).first()
+        if run and run.finished_at:
+            print(f"Leave accrual for {period:%Y-%m} already completed, skipping.")
+            return {'period': str(period), 'skipped': True}
+        if not run:
+            run = AccrualRun(period=period)
+            db.session.add(run)
+            db.session.commit()
 
-                if emp.emp_leave_balance is None or emp.emp_leave_balance < expected_balance:
-                    emp.emp_leave_balance = expected_balance
+        # Ledger entries and balances per primary-key chunk, one short transaction each.
+        # A chunk that hits a concurrent balance change fails the run without committing;
+        # re-running the task picks it up again since topped-up employees no longer match.
+        chunk_size = app.config.get('ACCRUAL_CHUNK_SIZE', 5000)
+        expected = expected_balance(today)
+        rows_touched = 0
+        last_id = 0
+        while True:
+            upper_id = db.session.scalar(
+                select(Employee.id).where(Employee.id > last_id)
+                .order_by(Employee.id).offset(chunk_size - 1).limit(1)
+            ) or db.session.scalar(select(func.max(Employee.id)).where(Employee.id > last_id))
+            if upper_id is None:
+                break
 
+            rows_touched += accrue_chunk(run, last_id, upper_id, expected, rows_touched)
+            db.session.commit()
+            last_id = upper_id
+
+        run.finished_at = datetime.now()
+        run.rows_touched = rows_touched
+        run.duration_ms = int((time.perf_counter() - started) * 1000)
         db.session.commit()
-        print("Leave accrual completed.")
+        print(f"Leave accrual completed: {rows_touched} employees updated in {run.duration_ms} ms.")
+        return {'period': str(period), 'rows_touched': rows_touched, 'duration_ms': run.duration_ms}
 
 
 @celery.task(name="tasks.leave.end_leave_status_check")
 def end_leave_status_check():
-    today = date.today()
-
-    # Get all employees currently on leave
-    on_leave_employees = Employee.query.filter_by(emp_work_status='on leave').all()
-
-    for emp in on_leave_employees:
-        # Get the most recent approved leave
-        recent_leave = LeaveRequest.query.filter_by(
-            employee_id=emp.id,
-            status=LeaveStatusEnum.APPROVED
-        ).order_by(LeaveRequest.end_date.desc()).first()
+    with app.app_context():
+        counts = apply_leave_transitions(date.today())
+        db.session.commit()
+        print(f"Checked and updated leave statuses: {counts}")
+        return counts
 
-        if recent_leave and recent_leave.end_date < today:
-            emp.emp_work_status = 'in office'
 
-    db.session.commit()
-    print("Checked and updated leave end statuses.")
\ No newline at end of file
+@celery.task(name="tasks.leave.reconcile_leave_balances")
+def reconcile_leave_balances():
+    with app.app_context():
+        counts = reconcile_balances()
+        db.session.commit()
+        print(f"Reconciled leave balances with the ledger: {counts}")
+        return counts
@@ -0,0 +1,35 @@
+from celery_worker import celery
+from db import db
+from datetime import date, datetime, timedelta
+from sqlalchemy import select
+
+from AttendanceManagement.classification import classify_attendance_day
+from AttendanceManagement.rollups import refresh_rollups
+from EmployeeManagement.models import Employee
+from LeaveManagement.workdays import working_calendars
+
+# Import the factory and create app
+from app import create_app
+
+app = create_app()  # Create the app instance
+
+@celery.task(name="tasks.attendance.classify_attendance")
+def classify_attendance(day=None):
+    with app.app_context():
+        # Defaults to yesterday, the last complete day
+        day = date.fromisoformat(day) if day else date.today() - timedelta(days=1)
+        config = app.config
+
+        # Weekends and public holidays come from each employee's country calendar
+        countries = db.session.scalars(select(Employee.country).where(Employee.emp_status == 'Active').distinct()).all()
+        counts = classify_attendance_day(
+            day,
+            shift_start=datetime.strptime(config['SHIFT_START'], '%H:%M').time(),
+            grace_minutes=config['LATE_GRACE_MINUTES'],
+            half_day_hours=config['HALF_DAY_HOURS'],
+            off_countries=working_calendars.non_working_countries(countries, day)
+        )
+        refresh_rollups(day, day)
+        db.session.commit()
+        print(f"Attendance classified for {day}: {counts}")
+        return counts
@@ -0,0 +1,24 @@
+from celery_worker import celery
+from db import db
+
+from LeaveManagement.outbox import drain_outbox
+
+# Import the factory and create app
+from app import create_app
+
+app = create_app()  # Create the app instance
+
+@celery.task(name="tasks.leave.drain_outbox")
+def drain_leave_outbox(max_batches=None):
+    with app.app_context():
+        config = app.config
+        counts = drain_outbox(
+            batch_size=config['OUTBOX_BATCH_SIZE'],
+            max_attempts=config['OUTBOX_MAX_ATTEMPTS'],
+            backoff_seconds=config['OUTBOX_BACKOFF_SECONDS'],
+            backoff_max_seconds=config['OUTBOX_BACKOFF_MAX_SECONDS'],
+            max_batches=max_batches
+        )
+        db.session.remove()
+        print(f"Leave outbox drained: {counts}")
+        return counts